@@ -20,6 +20,7 @@ setuptools.setup(
     keywords=['tree structure', 'data structure', 'binary search tree', 'binary heap'],
     packages=setuptools.find_packages(),
     python_requires='>=3',
+    extras_require={'numpy': ['numpy']},
     license_files=('./LICENSE',),
     classifiers=[
         'License :: OSI Approved :: Apache Software License',
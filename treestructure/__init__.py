@@ -48,7 +48,10 @@ Usage example:
 """
 
 from .binaryNode import BinaryNode
+from .weakBinaryNode import WeakBinaryNode
 from .binarySearchTree import BinarySearchTree
+from .frozenBinarySearchTree import FrozenBinarySearchTree
+from .arrayBinarySearchTree import ArrayBinarySearchTree
 from .binaryHeap import BinaryHeap
 from .constants import Constants
 from .version import __version__
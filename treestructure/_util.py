@@ -0,0 +1,141 @@
+"""
+Module of private helpers shared by trees.
+"""
+
+from typing import Union, Any, List, Iterator, TextIO
+from .constants import Constants
+from contextlib import contextmanager
+from array import array
+from itertools import islice
+import gc
+import json
+
+
+def _importNumpy(usage: str) -> Any:
+    """
+    Import NumPy when a feature needs it. NumPy is an optional dependency, it's not imported with the package.
+
+    :param usage: What NumPy is required for, it's shown in the error message.
+    :return: numpy module.
+    """
+
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError('NumPy is required to ' + usage + ', install it by pip install treestructure[numpy]') from None
+    return numpy
+
+
+@contextmanager
+def _pausedGarbageCollection(pause: bool = True) -> Iterator[None]:
+    """
+    Pause garbage collector while a large number of nodes are created.
+
+    Every node is reachable from the tree being built, collections triggered by allocations would find nothing.
+    Garbage collector is process-wide, it's paused for other threads too.
+
+    :param pause: Nothing is done if pause is False.
+    :return: Context manager.
+    """
+
+    if not pause:
+        yield
+        return
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _exportOrders(orders: Iterator[Union[float, int]], count: int, out: Any = None, typecode: str = 'd') -> Any:
+    """
+    Write orders into a typed buffer. Orders are taken from the iterator chunk by chunk.
+
+    :param orders: Iterator of orders.
+    :param count: Number of orders.
+    :param out: Writable one-dimensional buffer, e.g. array.array or numpy.ndarray, whose length is count. A new array
+    is created if out is None.
+    :param typecode: Typecode of new array if out is None. 'd' for float orders and 'q' for int orders.
+    :return: Buffer with orders.
+    """
+
+    if out is None:
+        if typecode not in ('d', 'q'):
+            raise Exception("Typecode should be 'd' or 'q'")
+        return array(typecode, orders)
+    view = memoryview(out)
+    if view.readonly:
+        raise Exception('Out should be writable')
+    if view.ndim != 1 or view.format not in ('b', 'B', 'h', 'H', 'i', 'I', 'l', 'L', 'q', 'Q', 'f', 'd'):
+        raise Exception('Out should be a one-dimensional float or int buffer')
+    if len(view) != count:
+        raise Exception('Length of out should be equal to node count')
+    # Copy by chunk, memory of the temporary array doesn't grow with tree.
+    chunkSize = 65536
+    for start in range(0, count, chunkSize):
+        view[start:start + chunkSize] = array(view.format, islice(orders, chunkSize))
+    return out
+
+
+def _dumpTree(fp: TextIO, rootNode: Union['BinaryNode', None], onlyOrder: bool = False,
+              heapList: Union[List['BinaryNode'], None] = None):
+    """
+    Write tree structure as JSON into file-like object without recursion. Output is the same as json.dump of package.
+
+    Memory is proportional to tree height. Nodes in bucket are written as a chain of right children.
+
+    :param fp: File-like object with write method.
+    :param rootNode: Root node of tree.
+    :param onlyOrder: Write tree only contains order in each node if onlyOrder is True.
+    :param heapList: Children are taken by position in this list instead of node pointers if it's giving.
+    :return: None.
+    """
+
+    encode = json.dumps
+    if onlyOrder:
+        emptyNode, separator, closing = '[null]', ', ', ']'
+    else:
+        emptyNode, separator, closing = 'null', ', ' + encode(Constants.BinaryNode.rightChildNode) + ': ', '}'
+        orderKey = '{' + encode(Constants.BinaryNode.order) + ': '
+        valueKey = ', ' + encode(Constants.BinaryNode.value) + ': '
+        leftKey = ', ' + encode(Constants.BinaryNode.leftChildNode) + ': '
+
+    def head(node: 'BinaryNode') -> str:
+        if onlyOrder:
+            return '[' + encode(node._order) + ', '
+        return orderKey + encode(node._order) + valueKey + encode(node._value) + leftKey
+
+    # Stack holds nodes, None for empty child, strings to write and nodes whose bucket should be written.
+    stk: List[Any] = [rootNode]
+    parts = []
+    while stk:
+        item = stk.pop()
+        if item is None:
+            parts.append(emptyNode)
+        elif type(item) is str:
+            parts.append(item)
+        elif type(item) is tuple:
+            for duplicateNode in item[0]._duplicateNodes:
+                parts.append(head(duplicateNode) + emptyNode + separator)
+        else:
+            parts.append(head(item))
+            # Brackets of the node and its bucket are closed together after right subtree.
+            stk.append(closing * (1 + len(item._duplicateNodes or ())))
+            if heapList is None:
+                leftNode, rightNode = item._leftChildNode, item._rightChildNode
+            else:
+                childIndex = 2 * item._index + 1
+                leftNode = heapList[childIndex] if childIndex < len(heapList) else None
+                rightNode = heapList[childIndex + 1] if childIndex + 1 < len(heapList) else None
+            stk.append(rightNode)
+            if item._duplicateNodes:
+                stk.append((item,))
+            stk.append(separator)
+            stk.append(leftNode)
+        if len(parts) >= 4096:
+            fp.write(''.join(parts))
+            parts.clear()
+    fp.write(''.join(parts))
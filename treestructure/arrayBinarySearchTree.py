@@ -0,0 +1,689 @@
+"""
+Module of array-backed binary search tree.
+"""
+
+from .binaryNode import BinaryNode
+from typing import Union, List, Iterator, Any
+from .constants import Constants
+from array import array
+
+
+class ArrayBinarySearchTree:
+
+    def __init__(self, typecode: str = 'd', balanced: bool = False):
+        """
+        Module of array-backed binary search tree.
+
+        Orders are stored in a typed array, links are stored as indexes in parallel arrays and values are stored in a
+        list. No node object is kept in tree, a binary node is created only when a node is returned. Links are 32-bit
+        int, tree can hold at most 2 ** 31 nodes.
+
+        :param typecode: Typecode of order array. 'd' for float orders and 'q' for int orders. Default is 'd'.
+        :param balanced: Keep tree height in O(log n) by AVL rotations while inserting and deleting if balanced is True.
+        Default is False.
+        """
+
+        if typecode not in ('d', 'q'):
+            raise Exception("Typecode should be 'd' or 'q'")
+        self._typecode = typecode
+        self._balanced = balanced
+        self._rootIndex = -1
+        # Head of free list. Freed slots are chained through left index array.
+        self._freeIndex = -1
+        self._orders = array(typecode)
+        self._values: List[Any] = []
+        self._leftIndexes = array('i')
+        self._rightIndexes = array('i')
+        self._parentIndexes = array('i')
+        self._heights = array('i')
+        self._sizes = array('i')
+
+    @property
+    def typecode(self) -> str:
+        return self._typecode
+
+    @property
+    def balanced(self) -> bool:
+        return self._balanced
+
+    def _typeCheck(self, order: Union[float, int]):
+        if self._typecode == 'q':
+            if type(order) is not int:
+                raise Exception('Type of order should be int')
+            if not -0x8000000000000000 <= order <= 0x7FFFFFFFFFFFFFFF:
+                raise Exception('Order should be a 64-bit int')
+        elif type(order) not in (float, int):
+            raise Exception('Type of order should be float or int')
+
+    def _newIndex(self, order: Union[float, int], value: Any) -> int:
+        """
+        Take a slot from free list, or append a new slot if free list is empty.
+
+        :param order: Node order.
+        :param value: Node value.
+        :return: Index of slot.
+        """
+
+        index = self._freeIndex
+        if index != -1:
+            # Order is stored first, slot stays in free list if order doesn't fit typecode.
+            self._orders[index] = order
+            self._freeIndex = self._leftIndexes[index]
+            self._values[index] = value
+            self._leftIndexes[index] = -1
+            self._heights[index] = 0
+            self._sizes[index] = 1
+        else:
+            index = len(self._orders)
+            # Links are stored in int arrays.
+            if index > 0x7FFFFFFF:
+                raise Exception('Tree can hold at most 2 ** 31 nodes')
+            self._orders.append(order)
+            self._values.append(value)
+            self._leftIndexes.append(-1)
+            self._rightIndexes.append(-1)
+            self._parentIndexes.append(-1)
+            self._heights.append(0)
+            self._sizes.append(1)
+        return index
+
+    def _releaseIndex(self, index: int):
+        """
+        Put a slot which leaves the tree into free list.
+
+        :param index: Index of slot.
+        :return: None.
+        """
+
+        self._values[index] = None
+        self._leftIndexes[index] = self._freeIndex
+        self._rightIndexes[index] = -1
+        self._parentIndexes[index] = -1
+        self._freeIndex = index
+
+    def _makeNode(self, index: int) -> BinaryNode:
+        """
+        Create a binary node with order and value of a slot. The node is not linked into tree.
+
+        :param index: Index of slot.
+        :return: Binary node.
+        """
+
+        return BinaryNode(self._orders[index], self._values[index])
+
+    def insertNode(self, node: BinaryNode):
+        """
+        Insert node into tree. Order and value of node are copied, the node itself is not kept.
+
+        :param node: node that will be joined.
+        :return: None.
+        """
+
+        self.insert(node._order, node._value)
+
+    def insert(self, order: Union[float, int], value: Any = None):
+        """
+        Insert order and value into tree without creating a binary node.
+
+        :param order: Node order.
+        :param value: Node value. Default value is None.
+        :return: None.
+        """
+
+        self._typeCheck(order)
+        index = self._newIndex(order, value)
+        if self._rootIndex == -1:
+            self._rootIndex = index
+            return
+        orders = self._orders
+        leftIndexes = self._leftIndexes
+        rightIndexes = self._rightIndexes
+        order = orders[index]
+        iterIndex = self._rootIndex
+        while True:
+            if orders[iterIndex] > order:
+                if leftIndexes[iterIndex] == -1:
+                    leftIndexes[iterIndex] = index
+                    break
+                iterIndex = leftIndexes[iterIndex]
+            else:
+                if rightIndexes[iterIndex] == -1:
+                    rightIndexes[iterIndex] = index
+                    break
+                iterIndex = rightIndexes[iterIndex]
+        self._parentIndexes[index] = iterIndex
+        self._retrace(iterIndex)
+
+    def deleteNode(self, order: Union[float, int]) -> Union[BinaryNode, None]:
+        """
+        Delete node by order.
+
+        :param order: Delete a node with giving order.
+        :return: The node that be removed. Return None if there's no node with giving order.
+        """
+
+        index = self._searchIndex(order)
+        if index == -1:
+            return None
+        node = self._makeNode(index)
+        self._removeIndex(index)
+        return node
+
+    def _searchIndex(self, order: Union[float, int]) -> int:
+        """
+        Search a slot with giving order.
+
+        :param order: Node order.
+        :return: Index of slot. Return -1 if there's no node with giving order.
+        """
+
+        orders = self._orders
+        leftIndexes = self._leftIndexes
+        rightIndexes = self._rightIndexes
+        iterIndex = self._rootIndex
+        while iterIndex != -1:
+            iterOrder = orders[iterIndex]
+            if iterOrder == order:
+                return iterIndex
+            elif iterOrder > order:
+                iterIndex = leftIndexes[iterIndex]
+            else:
+                iterIndex = rightIndexes[iterIndex]
+        return -1
+
+    def _removeIndex(self, index: int):
+        """
+        Unlink a slot from tree and put it into free list.
+
+        A slot with two children takes order and value of the max slot in its left subtree, and that slot is unlinked
+        instead. The sequence of nodes in sorted list is kept.
+
+        :param index: Index of slot.
+        :return: None.
+        """
+
+        leftIndexes = self._leftIndexes
+        rightIndexes = self._rightIndexes
+        parentIndexes = self._parentIndexes
+        if leftIndexes[index] != -1 and rightIndexes[index] != -1:
+            maxIndexInLeft = leftIndexes[index]
+            while rightIndexes[maxIndexInLeft] != -1:
+                maxIndexInLeft = rightIndexes[maxIndexInLeft]
+            self._orders[index] = self._orders[maxIndexInLeft]
+            self._values[index] = self._values[maxIndexInLeft]
+            index = maxIndexInLeft
+        childIndex = leftIndexes[index] if leftIndexes[index] != -1 else rightIndexes[index]
+        parentIndex = parentIndexes[index]
+        if childIndex != -1:
+            parentIndexes[childIndex] = parentIndex
+        if parentIndex == -1:
+            self._rootIndex = childIndex
+        elif leftIndexes[parentIndex] == index:
+            leftIndexes[parentIndex] = childIndex
+        else:
+            rightIndexes[parentIndex] = childIndex
+        self._releaseIndex(index)
+        if parentIndex != -1:
+            self._retrace(parentIndex)
+
+    def _refreshIndex(self, index: int):
+        """
+        Recalculate height and node count bookkeeping of slot from its children.
+
+        :param index: Index of slot.
+        :return: None.
+        """
+
+        heights = self._heights
+        sizes = self._sizes
+        leftIndex = self._leftIndexes[index]
+        rightIndex = self._rightIndexes[index]
+        if leftIndex == -1:
+            if rightIndex == -1:
+                heights[index] = 0
+                sizes[index] = 1
+            else:
+                heights[index] = heights[rightIndex] + 1
+                sizes[index] = sizes[rightIndex] + 1
+        elif rightIndex == -1:
+            heights[index] = heights[leftIndex] + 1
+            sizes[index] = sizes[leftIndex] + 1
+        else:
+            heights[index] = max(heights[leftIndex], heights[rightIndex]) + 1
+            sizes[index] = sizes[leftIndex] + sizes[rightIndex] + 1
+
+    def _rotateLeft(self, index: int) -> int:
+        """
+        Rotate subtree left. Right child of slot becomes the root of subtree.
+
+        :param index: Index of root slot of subtree.
+        :return: Index of new root slot of subtree.
+        """
+
+        leftIndexes = self._leftIndexes
+        rightIndexes = self._rightIndexes
+        parentIndexes = self._parentIndexes
+        pivotIndex = rightIndexes[index]
+        rightIndexes[index] = leftIndexes[pivotIndex]
+        if leftIndexes[pivotIndex] != -1:
+            parentIndexes[leftIndexes[pivotIndex]] = index
+        parentIndex = parentIndexes[index]
+        parentIndexes[pivotIndex] = parentIndex
+        if parentIndex != -1:
+            if leftIndexes[parentIndex] == index:
+                leftIndexes[parentIndex] = pivotIndex
+            else:
+                rightIndexes[parentIndex] = pivotIndex
+        leftIndexes[pivotIndex] = index
+        parentIndexes[index] = pivotIndex
+        self._refreshIndex(index)
+        self._refreshIndex(pivotIndex)
+        return pivotIndex
+
+    def _rotateRight(self, index: int) -> int:
+        """
+        Rotate subtree right. Left child of slot becomes the root of subtree.
+
+        :param index: Index of root slot of subtree.
+        :return: Index of new root slot of subtree.
+        """
+
+        leftIndexes = self._leftIndexes
+        rightIndexes = self._rightIndexes
+        parentIndexes = self._parentIndexes
+        pivotIndex = leftIndexes[index]
+        leftIndexes[index] = rightIndexes[pivotIndex]
+        if rightIndexes[pivotIndex] != -1:
+            parentIndexes[rightIndexes[pivotIndex]] = index
+        parentIndex = parentIndexes[index]
+        parentIndexes[pivotIndex] = parentIndex
+        if parentIndex != -1:
+            if leftIndexes[parentIndex] == index:
+                leftIndexes[parentIndex] = pivotIndex
+            else:
+                rightIndexes[parentIndex] = pivotIndex
+        rightIndexes[pivotIndex] = index
+        parentIndexes[index] = pivotIndex
+        self._refreshIndex(index)
+        self._refreshIndex(pivotIndex)
+        return pivotIndex
+
+    def _rebalanceIndex(self, index: int) -> int:
+        """
+        Refresh slot and rotate its subtree if the heights of both sides differ by more than one.
+
+        Rotation only happens in balanced mode.
+
+        :param index: Index of root slot of subtree.
+        :return: Index of new root slot of subtree.
+        """
+
+        self._refreshIndex(index)
+        if not self._balanced:
+            return index
+        leftIndex = self._leftIndexes[index]
+        rightIndex = self._rightIndexes[index]
+        if leftIndex == -1:
+            balanceFactor = -1 - self._heights[rightIndex] if rightIndex != -1 else 0
+        elif rightIndex == -1:
+            balanceFactor = self._heights[leftIndex] + 1
+        else:
+            balanceFactor = self._heights[leftIndex] - self._heights[rightIndex]
+        if balanceFactor > 1:
+            if self._height(self._leftIndexes[leftIndex]) < self._height(self._rightIndexes[leftIndex]):
+                self._rotateLeft(leftIndex)
+            return self._rotateRight(index)
+        elif balanceFactor < -1:
+            if self._height(self._rightIndexes[rightIndex]) < self._height(self._leftIndexes[rightIndex]):
+                self._rotateRight(rightIndex)
+            return self._rotateLeft(index)
+        return index
+
+    def _retrace(self, index: int):
+        """
+        Walk from slot up to the root, refresh bookkeeping and rebalance each slot on the way.
+
+        :param index: Index of lowest slot whose subtree is changed.
+        :return: None.
+        """
+
+        while True:
+            index = self._rebalanceIndex(index)
+            parentIndex = self._parentIndexes[index]
+            if parentIndex == -1:
+                self._rootIndex = index
+                return
+            index = parentIndex
+
+    def height(self) -> int:
+        """
+        Tree height.
+
+        If there's no node in tree, height is -1.
+
+        If there's only one node in tree, height is 0.
+
+        :return: Tree height.
+        """
+
+        return self._height(self._rootIndex)
+
+    def _height(self, index: int) -> int:
+        """
+        Height of subtree rooted at slot. If index is -1, height is -1.
+
+        :param index: Index of slot.
+        :return: Tree height.
+        """
+
+        return self._heights[index] if index != -1 else -1
+
+    def nodeCount(self) -> int:
+        """
+        Calculate how many nodes are in tree.
+
+        :return: Nodes number in tree.
+        """
+
+        return self._nodeCount(self._rootIndex)
+
+    def _nodeCount(self, index: int) -> int:
+        """
+        Node count of subtree rooted at slot. If index is -1, node count is 0.
+
+        :param index: Index of slot.
+        :return: Nodes number in subtree.
+        """
+
+        return self._sizes[index] if index != -1 else 0
+
+    def orderedList(self, onlyOrder: bool = False) -> List[Union[BinaryNode, float, int]]:
+        """
+        Sort node by order.
+
+        :param onlyOrder: Return array only contains order if onlyOrder is True. Default is False.
+        :return: Sorted list.
+        """
+
+        orders = self._orders
+        if onlyOrder:
+            return [orders[index] for index in self._iterIndexes()]
+        else:
+            return [self._makeNode(index) for index in self._iterIndexes()]
+
+    def __iter__(self) -> Iterator[BinaryNode]:
+        """
+        Iterate nodes by order lazily. Each node is created when it's yielded.
+
+        Memory is proportional to tree height. Tree should not be modified during iteration.
+
+        :return: Iterator of node.
+        """
+
+        for index in self._iterIndexes():
+            yield self._makeNode(index)
+
+    def _iterIndexes(self) -> Iterator[int]:
+        """
+        Iterate slot indexes by order.
+
+        :return: Iterator of index.
+        """
+
+        leftIndexes = self._leftIndexes
+        rightIndexes = self._rightIndexes
+        stk = []
+        index = self._rootIndex
+        while index != -1 or stk:
+            while index != -1:
+                stk.append(index)
+                index = leftIndexes[index]
+            index = stk.pop()
+            yield index
+            index = rightIndexes[index]
+
+    def getNodeByOrder(self, order: Union[float, int]) -> Union[BinaryNode, None]:
+        """
+        Search a node with giving order.
+
+        :param order: Node order.
+        :return: Node with giving order. Return None if there's no node with giving order.
+        """
+
+        # Rotations can move nodes with same order to any side, keep searching left for the first one.
+        orders = self._orders
+        leftIndexes = self._leftIndexes
+        rightIndexes = self._rightIndexes
+        resultIndex = -1
+        iterIndex = self._rootIndex
+        while iterIndex != -1:
+            iterOrder = orders[iterIndex]
+            if iterOrder == order:
+                resultIndex = iterIndex
+                iterIndex = leftIndexes[iterIndex]
+            elif iterOrder > order:
+                iterIndex = leftIndexes[iterIndex]
+            else:
+                iterIndex = rightIndexes[iterIndex]
+        return self._makeNode(resultIndex) if resultIndex != -1 else None
+
+    def getRankByOrder(self, order: Union[float, int]) -> int:
+        """
+        Check the rank of node in sorted list with specific order. Rank start with 0.
+
+        If there's no node with giving order. Rank is -1.
+
+        :param order: Node order.
+        :return: Rank of node in sorted list. Return -1 if there's no node with giving order.
+        """
+
+        if self._searchIndex(order) == -1:
+            return -1
+        orders = self._orders
+        rank = 0
+        iterIndex = self._rootIndex
+        while iterIndex != -1:
+            if orders[iterIndex] < order:
+                rank += self._nodeCount(self._leftIndexes[iterIndex]) + 1
+                iterIndex = self._rightIndexes[iterIndex]
+            else:
+                iterIndex = self._leftIndexes[iterIndex]
+        return rank
+
+    def getNodeByRank(self, rank: int) -> Union[BinaryNode, None]:
+        """
+        Get node by giving rank in sorted list.
+
+        :param rank: Rank in sorted list.
+        :return: Node in tree. Return None if rank < 0 or rank >= node count.
+        """
+
+        if rank < 0:
+            return None
+        index = self._rootIndex
+        while index != -1:
+            leftCount = self._nodeCount(self._leftIndexes[index])
+            if rank < leftCount:
+                index = self._leftIndexes[index]
+            elif rank == leftCount:
+                return self._makeNode(index)
+            else:
+                rank -= leftCount + 1
+                index = self._rightIndexes[index]
+        return None
+
+    def maxNode(self) -> Union[BinaryNode, None]:
+        """
+        Get max order node in tree.
+
+        :return: Max order node in tree. Return None if tree is empty.
+        """
+
+        index = self._maxIndex()
+        return self._makeNode(index) if index != -1 else None
+
+    def minNode(self) -> Union[BinaryNode, None]:
+        """
+        Get min order node in tree.
+
+        :return: Min order node in tree. Return None if tree is empty.
+        """
+
+        index = self._minIndex()
+        return self._makeNode(index) if index != -1 else None
+
+    def _maxIndex(self) -> int:
+        """
+        Index of max order slot. Return -1 if tree is empty.
+
+        :return: Index of slot.
+        """
+
+        index = self._rootIndex
+        if index != -1:
+            while self._rightIndexes[index] != -1:
+                index = self._rightIndexes[index]
+        return index
+
+    def _minIndex(self) -> int:
+        """
+        Index of min order slot. Return -1 if tree is empty.
+
+        :return: Index of slot.
+        """
+
+        index = self._rootIndex
+        if index != -1:
+            while self._leftIndexes[index] != -1:
+                index = self._leftIndexes[index]
+        return index
+
+    def deleteMaxNode(self) -> Union[BinaryNode, None]:
+        """
+        Delete max order node in tree.
+
+        :return: The node that be removed. Return None if there's no node in tree.
+        """
+
+        index = self._maxIndex()
+        if index == -1:
+            return None
+        node = self._makeNode(index)
+        self._removeIndex(index)
+        return node
+
+    def deleteMinNode(self) -> Union[BinaryNode, None]:
+        """
+        Delete min order node in tree.
+
+        :return: The node that be removed. Return None if there's no node in tree.
+        """
+
+        index = self._minIndex()
+        if index == -1:
+            return None
+        node = self._makeNode(index)
+        self._removeIndex(index)
+        return node
+
+    def package(self, onlyOrder: bool = False) -> Union[dict, list, None]:
+        """
+        Package tree structure and return.
+
+        :param onlyOrder: Return tree only contains order in each node if onlyOrder is True. Default is False.
+        :return: Tree structure as dictionary. Return type is list if onlyOrder is True. Return None if tree is empty.
+        """
+
+        return self._package(self._rootIndex, onlyOrder)
+
+    def _package(self, index: int, onlyOrder: bool = False) -> Union[dict, list, None]:
+        """
+        Package subtree structure and return.
+
+        Tree is walked with a stack instead of recursion, so a deep unbalanced tree doesn't hit recursion limit.
+
+        :param index: Index of root slot of subtree.
+        :param onlyOrder: Return tree only contains order in each node if onlyOrder is True. Default is False.
+        :return: Tree structure as dictionary. Return type is list if onlyOrder is True. Return None if tree is empty.
+        Return [None] if tree is empty and onlyOrder is True.
+        """
+
+        if onlyOrder:
+            leftKey, rightKey = 1, 2
+        else:
+            leftKey, rightKey = Constants.BinaryNode.leftChildNode, Constants.BinaryNode.rightChildNode
+        # The root is packaged into slot of a holder, so every package is filled the same way.
+        holder = [None, None]
+        # Stack holds packages to fill, keys in them and slot indexes.
+        stk = [(holder, 0, index)]
+        while stk:
+            package, key, index = stk.pop()
+            if index == -1:
+                package[key] = [None] if onlyOrder else None
+                continue
+            if onlyOrder:
+                package[key] = [self._orders[index], None, None]
+            else:
+                package[key] = {
+                    Constants.BinaryNode.order: self._orders[index],
+                    Constants.BinaryNode.value: self._values[index],
+                    Constants.BinaryNode.leftChildNode: None,
+                    Constants.BinaryNode.rightChildNode: None
+                }
+            stk.append((package[key], rightKey, self._rightIndexes[index]))
+            stk.append((package[key], leftKey, self._leftIndexes[index]))
+        return holder[0]
+
+    def balance(self):
+        """
+        Make tree balance.
+
+        :return: None.
+        """
+
+        if self.nodeCount() > 2:
+            indexList = list(self._iterIndexes())
+            self._rootIndex = self._buildBalanced(indexList, 0, len(indexList))
+            self._parentIndexes[self._rootIndex] = -1
+
+    def _buildBalanced(self, indexList: List[int], lo: int, hi: int) -> int:
+        """
+        Relink slots sorted by order into a balanced subtree.
+
+        :param indexList: Indexes of slot sorted by order.
+        :param lo: Start position in list.
+        :param hi: End position in list, exclusive.
+        :return: Index of root slot of subtree. Return -1 if range is empty.
+        """
+
+        if lo >= hi:
+            return -1
+        mid = (lo + hi) // 2
+        index = indexList[mid]
+        leftIndex = self._buildBalanced(indexList, lo, mid)
+        rightIndex = self._buildBalanced(indexList, mid + 1, hi)
+        self._leftIndexes[index] = leftIndex
+        self._rightIndexes[index] = rightIndex
+        if leftIndex != -1:
+            self._parentIndexes[leftIndex] = index
+        if rightIndex != -1:
+            self._parentIndexes[rightIndex] = index
+        self._refreshIndex(index)
+        return index
+
+    def clear(self):
+        """
+        Clear tree.
+
+        :return: None.
+        """
+
+        self._rootIndex = -1
+        self._freeIndex = -1
+        self._orders = array(self._typecode)
+        self._values = []
+        self._leftIndexes = array('i')
+        self._rightIndexes = array('i')
+        self._parentIndexes = array('i')
+        self._heights = array('i')
+        self._sizes = array('i')
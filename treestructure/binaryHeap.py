@@ -5,15 +5,19 @@ I make some improvement to reduce time complexity of searching node from O(n) to
 """
 
 from .binaryNode import BinaryNode
+from .weakBinaryNode import _checkNodeClass
+from ._util import _pausedGarbageCollection, _exportOrders, _dumpTree
 from .constants import Constants
-from typing import Union, Deque, List
-from collections import deque
+from typing import Union, Deque, List, Iterable, Any, TextIO, Tuple, Type
+from collections import deque, OrderedDict
 from itertools import islice
 from random import choice
+from operator import attrgetter
 
 
 class BinaryHeap:
-    def __init__(self, node: Union[BinaryNode, None] = None, heapStruct: str = Constants.BinaryHeap.min):
+    def __init__(self, node: Union[BinaryNode, None] = None, heapStruct: str = Constants.BinaryHeap.min,
+                 implicit: bool = False, nodeClass: Type[BinaryNode] = BinaryNode):
         """
         Module of binary heap.
 
@@ -21,18 +25,29 @@ class BinaryHeap:
         :param heapStruct: It defines the structure of tree should be min heap or max heap.
         It can be 'min' or 'max'.
         Default struct is min heap.
+        :param implicit: Keep only heap list and node index if implicit is True. Parent and children are derived by
+        index arithmetic, node pointers are not maintained and can be filled by linkNodes. Operations of heap work the
+        same, only walking heap through node pointers is given up. Default is False.
+        :param nodeClass: Class of nodes which heap creates from (order, value) pairs and order arrays. Use
+        WeakBinaryNode to keep heap free of reference cycles, then every node of heap should be WeakBinaryNode.
+        Default is BinaryNode.
         """
 
         if heapStruct != Constants.BinaryHeap.min and heapStruct != Constants.BinaryHeap.max:
             raise Exception('Heap struct can only be min or max')
         self._heapStruct = heapStruct
-        self._heapList: Deque[BinaryNode] = deque()
+        self._implicit = implicit
+        self._nodeClass = nodeClass
+        # Children of position i are at 2 * i + 1 and 2 * i + 2.
+        self._heapList: List[BinaryNode] = []
         # Store node into a hashtable for increasing searching time.
+        # A single node of an order is stored directly. Once there're nodes with same order, they're kept as keys of an
+        # OrderedDict, so first node is found and any node is removed in O(1).
         self._heapDict = {}
         if node:
             self._checkNodeConnection(node)
             self._heapList.append(node)
-            self._heapDict[node._order] = deque([node])
+            self._heapDict[node._order] = node
             node._index = 0
             node._inTree = True
 
@@ -40,9 +55,139 @@ class BinaryHeap:
     def heapStruct(self) -> str:
         return self._heapStruct
 
+    @property
+    def implicit(self) -> bool:
+        return self._implicit
+
+    @property
+    def nodeClass(self) -> Type[BinaryNode]:
+        return self._nodeClass
+
+    @classmethod
+    def fromIterable(cls, nodes: Iterable[Union[BinaryNode, Tuple[Union[float, int], Any]]],
+                     heapStruct: str = Constants.BinaryHeap.min, implicit: bool = False,
+                     pauseGc: bool = False, nodeClass: Type[BinaryNode] = BinaryNode) -> 'BinaryHeap':
+        """
+        Build a heap from nodes in O(n). Nodes are laid out and put into dictionary in one pass, then heapified
+        bottom-up.
+
+        :param nodes: Binary nodes or (order, value) pairs.
+        :param heapStruct: It defines the structure of tree should be min heap or max heap.
+        It can be 'min' or 'max'.
+        Default struct is min heap.
+        :param implicit: Implicit mode of the new heap. Default is False.
+        :param pauseGc: Pause garbage collector while nodes are created if pauseGc is True. It's faster for a large
+        build, but garbage collector is paused for the whole process, other threads included. Default is False.
+        :param nodeClass: Node class of the new heap. Default is BinaryNode.
+        :return: New heap.
+        """
+
+        heap = cls(heapStruct=heapStruct, implicit=implicit, nodeClass=nodeClass)
+        nodeList = heap._heapList
+        heapDict = heap._heapDict
+        with _pausedGarbageCollection(pauseGc):
+            for index, node in enumerate(nodes):
+                if not isinstance(node, BinaryNode):
+                    order, value = node
+                    node = nodeClass(order, value)
+                else:
+                    try:
+                        # The same node may appear twice in iterable.
+                        heap._checkNodeConnection(node)
+                    except Exception:
+                        for laidNode in nodeList:
+                            laidNode._index = -1
+                            laidNode._inTree = False
+                        raise
+                node._index = index
+                node._inTree = True
+                nodeList.append(node)
+                # Same as _appendNodeIntoDict, a single dict operation for a new order.
+                bucket = heapDict.setdefault(node._order, node)
+                if bucket is not node:
+                    if type(bucket) is OrderedDict:
+                        bucket[node] = None
+                    else:
+                        heapDict[node._order] = OrderedDict.fromkeys((bucket, node))
+            heap._heapify()
+        return heap
+
+    @classmethod
+    def fromArray(cls, orders: Any, values: Union[Iterable[Any], None] = None,
+                  heapStruct: str = Constants.BinaryHeap.min, implicit: bool = False,
+                  pauseGc: bool = False, nodeClass: Type[BinaryNode] = BinaryNode) -> 'BinaryHeap':
+        """
+        Build a heap from an order array. NumPy is required.
+
+        Orders are type checked and sorted by NumPy, a sorted list is already a heap.
+
+        :param orders: NumPy array or buffer-protocol object of orders.
+        :param values: Values in the same sequence as orders. Default is None, all values are None.
+        :param heapStruct: It defines the structure of tree should be min heap or max heap.
+        It can be 'min' or 'max'.
+        Default struct is min heap.
+        :param implicit: Implicit mode of the new heap. Default is False.
+        :param pauseGc: Pause garbage collector while nodes are created if pauseGc is True. It's faster for a large
+        build, but garbage collector is paused for the whole process, other threads included. Default is False.
+        :param nodeClass: Node class of the new heap. Default is BinaryNode.
+        :return: New heap.
+        """
+
+        heap = cls(heapStruct=heapStruct, implicit=implicit, nodeClass=nodeClass)
+        with _pausedGarbageCollection(pauseGc):
+            nodeList = nodeClass._sortedFromArray(orders, values)
+            for node in nodeList:
+                heap._appendNodeIntoDict(node)
+            if heapStruct == Constants.BinaryHeap.max:
+                nodeList.reverse()
+            heap._linkNodes(nodeList)
+        return heap
+
+    def _linkNodes(self, nodeList: List[BinaryNode]):
+        """
+        Take nodes as heap list. Nodes should be in heap order already.
+
+        :param nodeList: List of node.
+        :return: None.
+        """
+
+        for index, node in enumerate(nodeList):
+            node._index = index
+            node._inTree = True
+        self._heapList = nodeList
+        if not self._implicit:
+            self._linkAll()
+
+    def linkNodes(self):
+        """
+        Fill parent and children of each node by its position in heap.
+
+        Pointers are always up to date if heap is not implicit. In implicit mode, pointers are a snapshot which is not
+        maintained by later operations.
+
+        :return: None.
+        """
+
+        self._linkAll()
+
+    def _linkAll(self):
+        """
+        Refresh parent and children of all nodes by their positions.
+
+        :return: None.
+        """
+
+        heapList = self._heapList
+        length = len(heapList)
+        for index, node in enumerate(heapList):
+            node._parentNode = heapList[(index - 1) >> 1] if index else None
+            childIndex = 2 * index + 1
+            node._leftChildNode = heapList[childIndex] if childIndex < length else None
+            node._rightChildNode = heapList[childIndex + 1] if childIndex + 1 < length else None
+
     def _checkNodeConnection(self, node: Union[BinaryNode, None] = None):
         """
-        Check whether node is already in another tree.
+        Check whether node is already in another tree, and whether it can be linked with nodes of this heap.
 
         :param node: Heap node to check.
         :return: None.
@@ -51,6 +196,19 @@ class BinaryHeap:
         if node:
             if node._inTree:
                 raise Exception('Node is already in other tree')
+            _checkNodeClass(type(node), self._nodeClass)
+
+    def _checkNodeInHeap(self, node: BinaryNode):
+        """
+        Check whether node is in this heap.
+
+        :param node: Heap node to check.
+        :return: None.
+        """
+
+        index = node._index
+        if not node._inTree or index < 0 or index >= len(self._heapList) or self._heapList[index] is not node:
+            raise Exception('Node is not in this heap')
 
     def _appendNodeIntoDict(self, node: BinaryNode):
         """
@@ -60,10 +218,13 @@ class BinaryHeap:
         :return: None.
         """
 
-        if node._order in self._heapDict:
-            self._heapDict[node._order].append(node)
+        bucket = self._heapDict.get(node._order)
+        if bucket is None:
+            self._heapDict[node._order] = node
+        elif type(bucket) is OrderedDict:
+            bucket[node] = None
         else:
-            self._heapDict[node._order] = deque([node])
+            self._heapDict[node._order] = OrderedDict.fromkeys((bucket, node))
 
     def _deleteNodeInDictByOrder(self, order: Union[float, int]):
         """
@@ -73,10 +234,29 @@ class BinaryHeap:
         :return: None.
         """
 
-        if order in self._heapDict:
-            self._heapDict[order].popleft()
-            if not len(self._heapDict[order]):
-                del self._heapDict[order]
+        bucket = self._heapDict.get(order)
+        if type(bucket) is OrderedDict:
+            bucket.popitem(last=False)
+            if len(bucket) == 1:
+                self._heapDict[order] = next(iter(bucket))
+        elif bucket is not None:
+            del self._heapDict[order]
+
+    def _deleteNodeInDict(self, node: BinaryNode):
+        """
+        Delete a specific heap node from dictionary.
+
+        :param node: Heap node that will be removed.
+        :return: None.
+        """
+
+        bucket = self._heapDict[node._order]
+        if type(bucket) is OrderedDict:
+            del bucket[node]
+            if len(bucket) == 1:
+                self._heapDict[node._order] = next(iter(bucket))
+        else:
+            del self._heapDict[node._order]
 
     def _compare(self, x: Union[float, int], y: Union[float, int]) -> bool:
         """
@@ -92,155 +272,123 @@ class BinaryHeap:
         elif self._heapStruct == Constants.BinaryHeap.max:
             return x > y
 
-    def _getSwapChild(self, node: BinaryNode) -> Union[BinaryNode, None]:
+    def _siftUp(self, index: int) -> int:
         """
-        Get child node to swap.
+        Move node at index up while it should be above its parent. Parents on the way are moved down one level.
 
-        :param node: Node to swap.
-        :return: Child node to swap. Return None if swapping is not necessary.
+        :param index: Position of node.
+        :return: Final position of node.
         """
 
-        if not node._leftChildNode and not node._rightChildNode:
-            return None
-        elif node._leftChildNode and not node._rightChildNode:
-            if self._heapStruct == Constants.BinaryHeap.min:
-                if node._order > node._leftChildNode._order:
-                    return node._leftChildNode
-                else:
-                    return None
-            elif self._heapStruct == Constants.BinaryHeap.max:
-                if node._order < node._leftChildNode._order:
-                    return node._leftChildNode
-                else:
-                    return None
-        elif not node._leftChildNode and node._rightChildNode:
-            if self._heapStruct == Constants.BinaryHeap.min:
-                if node._order > node._rightChildNode._order:
-                    return node._rightChildNode
-                else:
-                    return None
-            elif self._heapStruct == Constants.BinaryHeap.max:
-                if node._order < node._rightChildNode._order:
-                    return node._rightChildNode
-                else:
-                    return None
+        heapList = self._heapList
+        node = heapList[index]
+        order = node._order
+        # Loops are written out for each struct, comparison is the hot spot.
+        if self._heapStruct == Constants.BinaryHeap.min:
+            while index:
+                parentIndex = (index - 1) >> 1
+                parentNode = heapList[parentIndex]
+                if order >= parentNode._order:
+                    break
+                heapList[index] = parentNode
+                parentNode._index = index
+                index = parentIndex
         else:
-            if self._heapStruct == Constants.BinaryHeap.min:
-                if node._leftChildNode._order < node._rightChildNode._order:
-                    if node._order > node._leftChildNode._order:
-                        return node._leftChildNode
-                    else:
-                        return None
-                else:
-                    if node._order > node._rightChildNode._order:
-                        return node._rightChildNode
-                    else:
-                        return None
-            elif self._heapStruct == Constants.BinaryHeap.max:
-                if node._leftChildNode._order > node._rightChildNode._order:
-                    if node._order < node._leftChildNode._order:
-                        return node._leftChildNode
-                    else:
-                        return None
-                else:
-                    if node._order < node._rightChildNode._order:
-                        return node._rightChildNode
-                    else:
-                        return None
+            while index:
+                parentIndex = (index - 1) >> 1
+                parentNode = heapList[parentIndex]
+                if order <= parentNode._order:
+                    break
+                heapList[index] = parentNode
+                parentNode._index = index
+                index = parentIndex
+        heapList[index] = node
+        node._index = index
+        return index
 
-    def _swapUp(self, node: BinaryNode):
+    def _siftDown(self, index: int) -> int:
         """
-        Swap up with parent node.
-
-        :param node: Node to swap.
-        :return: None.
-        """
-
-        parentNode = node._parentNode
-        while parentNode and self._compare(node._order, parentNode._order):
-            self._heapList[parentNode._index], self._heapList[node._index] = \
-                self._heapList[node._index], self._heapList[parentNode._index]
+        Move node at index down while a child should be above it. Children on the way are moved up one level.
 
-            parentNode._index, node._index = node._index, parentNode._index
+        Right child is taken if children have the same order.
 
-            if parentNode._leftChildNode == node:
-                node._rightChildNode, parentNode._rightChildNode = parentNode._rightChildNode, node._rightChildNode
-                parentNode._leftChildNode = node._leftChildNode
-                node._leftChildNode = parentNode
-                if node._rightChildNode:
-                    node._rightChildNode._parentNode = node
-                if parentNode._rightChildNode:
-                    parentNode._rightChildNode._parentNode = parentNode
-                if parentNode._leftChildNode:
-                    parentNode._leftChildNode._parentNode = parentNode
-            else:
-                node._leftChildNode, parentNode._leftChildNode = parentNode._leftChildNode, node._leftChildNode
-                parentNode._rightChildNode = node._rightChildNode
-                node._rightChildNode = parentNode
-                if node._leftChildNode:
-                    node._leftChildNode._parentNode = node
-                if parentNode._leftChildNode:
-                    parentNode._leftChildNode._parentNode = parentNode
-                if parentNode._rightChildNode:
-                    parentNode._rightChildNode._parentNode = parentNode
-
-            node._parentNode = parentNode._parentNode
-            parentNode._parentNode = node
-
-            if node._parentNode:
-                if node._parentNode._leftChildNode == parentNode:
-                    node._parentNode._leftChildNode = node
-                else:
-                    node._parentNode._rightChildNode = node
-
-            parentNode = node._parentNode
-
-    def _swapDown(self, node: BinaryNode):
+        :param index: Position of node.
+        :return: Final position of node.
         """
-        Swap down with children node.
 
-        :param node: Node to swap.
+        heapList = self._heapList
+        length = len(heapList)
+        node = heapList[index]
+        order = node._order
+        childIndex = 2 * index + 1
+        if self._heapStruct == Constants.BinaryHeap.min:
+            while childIndex < length:
+                childNode = heapList[childIndex]
+                if childIndex + 1 < length and heapList[childIndex + 1]._order <= childNode._order:
+                    childIndex += 1
+                    childNode = heapList[childIndex]
+                if childNode._order >= order:
+                    break
+                heapList[index] = childNode
+                childNode._index = index
+                index = childIndex
+                childIndex = 2 * index + 1
+        else:
+            while childIndex < length:
+                childNode = heapList[childIndex]
+                if childIndex + 1 < length and heapList[childIndex + 1]._order >= childNode._order:
+                    childIndex += 1
+                    childNode = heapList[childIndex]
+                if childNode._order <= order:
+                    break
+                heapList[index] = childNode
+                childNode._index = index
+                index = childIndex
+                childIndex = 2 * index + 1
+        heapList[index] = node
+        node._index = index
+        return index
+
+    def _linkPath(self, index: int, topIndex: int):
+        """
+        Refresh node pointers of positions on the path from index up to topIndex. Nothing is done in implicit mode.
+
+        Positions out of the path keep their nodes, so their pointers are refreshed from both sides.
+
+        :param index: Lower position.
+        :param topIndex: Upper position, it should be index or an ancestor of index.
         :return: None.
         """
 
-        childNode = self._getSwapChild(node)
-        while childNode:
-            self._heapList[childNode._index], self._heapList[node._index] = \
-                self._heapList[node._index], self._heapList[childNode._index]
-
-            childNode._index, node._index = node._index, childNode._index
-
-            if node._leftChildNode == childNode:
-                childNode._rightChildNode, node._rightChildNode = node._rightChildNode, childNode._rightChildNode
-                node._leftChildNode = childNode._leftChildNode
-                childNode._leftChildNode = node
-                if childNode._rightChildNode:
-                    childNode._rightChildNode._parentNode = childNode
-                if node._rightChildNode:
-                    node._rightChildNode._parentNode = node
-                if node._leftChildNode:
-                    node._leftChildNode._parentNode = node
-            else:
-                childNode._leftChildNode, node._leftChildNode = node._leftChildNode, childNode._leftChildNode
-                node._rightChildNode = childNode._rightChildNode
-                childNode._rightChildNode = node
-                if childNode._leftChildNode:
-                    childNode._leftChildNode._parentNode = childNode
-                if node._leftChildNode:
-                    node._leftChildNode._parentNode = node
-                if node._rightChildNode:
-                    node._rightChildNode._parentNode = node
-
-            childNode._parentNode = node._parentNode
-            node._parentNode = childNode
-
-            if childNode._parentNode:
-                if childNode._parentNode._leftChildNode == node:
-                    childNode._parentNode._leftChildNode = childNode
+        if self._implicit:
+            return
+        heapList = self._heapList
+        length = len(heapList)
+        while True:
+            node = heapList[index]
+            if index:
+                parentNode = heapList[(index - 1) >> 1]
+                node._parentNode = parentNode
+                if index & 1:
+                    parentNode._leftChildNode = node
                 else:
-                    childNode._parentNode._rightChildNode = childNode
-
-            childNode = self._getSwapChild(node)
+                    parentNode._rightChildNode = node
+            else:
+                node._parentNode = None
+            childIndex = 2 * index + 1
+            if childIndex < length:
+                node._leftChildNode = heapList[childIndex]
+                node._leftChildNode._parentNode = node
+            else:
+                node._leftChildNode = None
+            if childIndex + 1 < length:
+                node._rightChildNode = heapList[childIndex + 1]
+                node._rightChildNode._parentNode = node
+            else:
+                node._rightChildNode = None
+            if index <= topIndex:
+                return
+            index = (index - 1) >> 1
 
     def insertNode(self, node: BinaryNode):
         """
@@ -252,18 +400,10 @@ class BinaryHeap:
 
         self._checkNodeConnection(node)
         node._inTree = True
-        if self._heapList and node == self._heapList[0]:
-            raise Exception('Node is already in other tree')
         self._heapList.append(node)
         self._appendNodeIntoDict(node)
-        node._index = len(self._heapList) - 1
-        if node._index:
-            node._parentNode = self._heapList[-(node._index // -2) - 1]
-            if node._index % 2:
-                node._parentNode._leftChildNode = node
-            else:
-                node._parentNode._rightChildNode = node
-            self._swapUp(node)
+        index = len(self._heapList) - 1
+        self._linkPath(index, self._siftUp(index))
 
     def deleteNode(self, order: Union[float, int]) -> Union[BinaryNode, None]:
         """
@@ -276,79 +416,126 @@ class BinaryHeap:
         deleteNode = self.getNodeByOrder(order)
         if deleteNode:
             self._deleteNodeInDictByOrder(order)
-            node = self._heapList[-1]
-            if len(self._heapList) == 1:
-                deleteNode._index = -1
-                self._heapList.pop()
-                return deleteNode
-            elif node == deleteNode:
-                if deleteNode._parentNode._rightChildNode == deleteNode:
-                    deleteNode._parentNode._rightChildNode = None
-                else:
-                    deleteNode._parentNode._leftChildNode = None
-                deleteNode._parentNode = None
-                deleteNode._index = -1
-                self._heapList.pop()
-                return deleteNode
-            elif deleteNode._index == -(node._index // -2) - 1:
-                self._heapList[deleteNode._index], self._heapList[node._index] = \
-                    self._heapList[node._index], self._heapList[deleteNode._index]
-
-                node._index = deleteNode._index
-
-                if deleteNode._leftChildNode == node:
-                    node._rightChildNode = deleteNode._rightChildNode
-                    node._leftChildNode = None
-                    if node._rightChildNode:
-                        node._rightChildNode._parentNode = node
-                else:
-                    node._leftChildNode = deleteNode._leftChildNode
-                    node._rightChildNode = None
-                    if node._leftChildNode:
-                        node._leftChildNode._parentNode = node
+            self._removeAt(deleteNode._index)
+        return deleteNode
 
-                node._parentNode = deleteNode._parentNode
+    def updateOrder(self, node: BinaryNode, newOrder: Union[float, int]):
+        """
+        Change order of a node in heap. Node is sifted once from its position.
 
-                if node._parentNode:
-                    if node._parentNode._leftChildNode == deleteNode:
-                        node._parentNode._leftChildNode = node
-                    else:
-                        node._parentNode._rightChildNode = node
-            else:
-                self._heapList[deleteNode._index], self._heapList[node._index] = \
-                    self._heapList[node._index], self._heapList[deleteNode._index]
+        :param node: Node in heap.
+        :param newOrder: New order of node.
+        :return: None.
+        """
 
-                node._index = deleteNode._index
+        node._typeCheck(newOrder)
+        self._checkNodeInHeap(node)
+        index = node._index
+        oldOrder = node._order
+        if newOrder == oldOrder:
+            return
+        self._deleteNodeInDict(node)
+        # Order setter refuses nodes in tree, it's set directly.
+        node._order = newOrder
+        self._appendNodeIntoDict(node)
+        if self._compare(newOrder, oldOrder):
+            self._linkPath(index, self._siftUp(index))
+        else:
+            self._linkPath(self._siftDown(index), index)
 
-                if node._parentNode._leftChildNode == node:
-                    node._parentNode._leftChildNode = None
-                else:
-                    node._parentNode._rightChildNode = None
-                node._parentNode = deleteNode._parentNode
-                node._leftChildNode = deleteNode._leftChildNode
-                node._rightChildNode = deleteNode._rightChildNode
-                if node._parentNode:
-                    if node._parentNode._leftChildNode == deleteNode:
-                        node._parentNode._leftChildNode = node
-                    else:
-                        node._parentNode._rightChildNode = node
-                if node._leftChildNode:
-                    node._leftChildNode._parentNode = node
-                if node._rightChildNode:
-                    node._rightChildNode._parentNode = node
-
-            deleteNode._parentNode = None
-            deleteNode._leftChildNode = None
-            deleteNode._rightChildNode = None
-            deleteNode._index = -1
-            deleteNode._inTree = False
-            self._heapList.pop()
-
-            if node._parentNode and self._compare(node._order, node._parentNode._order):
-                self._swapUp(node)
+    def removeNode(self, node: BinaryNode) -> BinaryNode:
+        """
+        Remove a specific node from heap by the node itself. Other nodes with same order are kept.
+
+        :param node: Node in heap.
+        :return: The node that be removed.
+        """
+
+        self._checkNodeInHeap(node)
+        self._deleteNodeInDict(node)
+        return self._removeAt(node._index)
+
+    def _removeAt(self, index: int) -> BinaryNode:
+        """
+        Remove node at position from heap list. Last node takes the position and is sifted. Dictionary is not changed.
+
+        :param index: Position of node.
+        :return: The node that be removed.
+        """
+
+        heapList = self._heapList
+        node = heapList[index]
+        lastNode = heapList.pop()
+        length = len(heapList)
+        if length and not self._implicit:
+            # Last position is vacated.
+            if length & 1:
+                heapList[(length - 1) >> 1]._leftChildNode = None
             else:
-                self._swapDown(node)
-        return deleteNode
+                heapList[(length - 1) >> 1]._rightChildNode = None
+        if lastNode is not node:
+            heapList[index] = lastNode
+            lastNode._index = index
+            if index and self._compare(lastNode._order, heapList[(index - 1) >> 1]._order):
+                self._linkPath(index, self._siftUp(index))
+            else:
+                self._linkPath(self._siftDown(index), index)
+        node._parentNode = None
+        node._leftChildNode = None
+        node._rightChildNode = None
+        node._index = -1
+        node._inTree = False
+        return node
+
+    def pushPop(self, node: BinaryNode) -> BinaryNode:
+        """
+        Insert node and then delete top node, sifting only once.
+
+        Heap is not changed if node would be the top itself, node is returned directly.
+
+        :param node: node that will be joined.
+        :return: The node that be removed.
+        """
+
+        self._checkNodeConnection(node)
+        if not self._heapList or not self._compare(self._heapList[0]._order, node._order):
+            return node
+        return self._replaceRoot(node)
+
+    def replaceTop(self, node: BinaryNode) -> Union[BinaryNode, None]:
+        """
+        Delete top node and then insert node, sifting only once.
+
+        :param node: node that will be joined.
+        :return: The node that be removed. Return None if there's no node in tree, node is inserted.
+        """
+
+        self._checkNodeConnection(node)
+        if not self._heapList:
+            self.insertNode(node)
+            return None
+        return self._replaceRoot(node)
+
+    def _replaceRoot(self, node: BinaryNode) -> BinaryNode:
+        """
+        Put node at top position and sift it down.
+
+        :param node: Node not in tree.
+        :return: The node that be removed.
+        """
+
+        topNode = self._heapList[0]
+        self._deleteNodeInDict(topNode)
+        node._inTree = True
+        self._heapList[0] = node
+        self._appendNodeIntoDict(node)
+        self._linkPath(self._siftDown(0), 0)
+        topNode._parentNode = None
+        topNode._leftChildNode = None
+        topNode._rightChildNode = None
+        topNode._index = -1
+        topNode._inTree = False
+        return topNode
 
     def height(self) -> int:
         """
@@ -408,7 +595,7 @@ class BinaryHeap:
                         returnList[maxChildNodeIdx], returnList[currentIdx] = returnList[currentIdx], returnList[
                             maxChildNodeIdx]
                         currentIdx = maxChildNodeIdx
-            if onlyOrder:
+            if onlyOrder and returnList:
                 returnList[0] = returnList[0]._order
         elif self._heapStruct == Constants.BinaryHeap.min:
             returnList.reverse()
@@ -434,10 +621,40 @@ class BinaryHeap:
                         returnList[minChildNodeIdx], returnList[currentIdx] = returnList[currentIdx], returnList[
                             minChildNodeIdx]
                         currentIdx = minChildNodeIdx
-            if onlyOrder:
+            if onlyOrder and returnList:
                 returnList[-1] = returnList[-1]._order
         return list(returnList)
 
+    def exportOrders(self, out: Any = None, typecode: str = 'd') -> Any:
+        """
+        Write sorted orders into a typed buffer.
+
+        Heap isn't sorted, orders are sorted in a temporary list first. The list holds one reference per node, O(n)
+        extra memory.
+
+        :param out: Writable one-dimensional buffer, e.g. array.array or numpy.ndarray, whose length is node count.
+        Default is None, a new array.array is created.
+        :param typecode: Typecode of new array if out is None. 'd' for float orders and 'q' for int orders. Default is
+        'd'.
+        :return: Buffer with sorted orders. It's out if out is given.
+        """
+
+        return _exportOrders(iter(sorted(map(attrgetter('_order'), self._heapList))), len(self._heapList), out,
+                             typecode)
+
+    def exportHeap(self, out: Any = None, typecode: str = 'd') -> Any:
+        """
+        Write orders in heap layout into a typed buffer. Children of position i are at 2 * i + 1 and 2 * i + 2.
+
+        :param out: Writable one-dimensional buffer, e.g. array.array or numpy.ndarray, whose length is node count.
+        Default is None, a new array.array is created.
+        :param typecode: Typecode of new array if out is None. 'd' for float orders and 'q' for int orders. Default is
+        'd'.
+        :return: Buffer with orders in heap layout. It's out if out is given.
+        """
+
+        return _exportOrders(map(attrgetter('_order'), self._heapList), len(self._heapList), out, typecode)
+
     def getNodeByOrder(self, order: Union[float, int]) -> Union[BinaryNode, None]:
         """
         Search a node with giving order.
@@ -446,7 +663,8 @@ class BinaryHeap:
         :return: Node with giving order. Return None if there's no node with giving order.
         """
 
-        return self._heapDict.get(order, [None])[0]
+        bucket = self._heapDict.get(order)
+        return next(iter(bucket)) if type(bucket) is OrderedDict else bucket
 
     def getRankByOrder(self, order: Union[float, int]) -> int:
         """
@@ -480,7 +698,7 @@ class BinaryHeap:
             return None
         return self._getNodeByRank(self._heapList, rank)
 
-    def _getNodeByRank(self, array: Deque[BinaryNode], rank: int) -> Union[BinaryNode, None]:
+    def _getNodeByRank(self, array: Union[List[BinaryNode], Deque[BinaryNode]], rank: int) -> Union[BinaryNode, None]:
         """
         Get node by giving rank in sorted list with specific tree.
 
@@ -580,44 +798,52 @@ class BinaryHeap:
         Return [None] if tree is empty and onlyOrder is True.
         """
 
-        if self._heapList:
-            return self._package(self._heapList[0], onlyOrder)
-        else:
-            if onlyOrder:
-                return [None]
-            else:
-                return None
+        return self._package(0, onlyOrder)
 
-    def _package(self, node: Union[BinaryNode, None], onlyOrder: bool = False) -> Union[dict, list, None]:
+    def _package(self, index: int, onlyOrder: bool = False) -> Union[dict, list, None]:
         """
         Package tree structure and return.
 
-        :param node: Root node of tree.
+        :param index: Position of root node of tree.
         :param onlyOrder: Return tree only contains order in each node if onlyOrder is True. Default is False.
         :return: Tree structure as dictionary. Return type is list if onlyOrder is True. Return None if tree is empty.
         Return [None] if tree is empty and onlyOrder is True.
         """
 
-        if not node:
+        if index >= len(self._heapList):
             if onlyOrder:
                 return [None]
             else:
                 return None
         else:
+            node = self._heapList[index]
             if onlyOrder:
                 return [
                     node._order,
-                    self._package(node._leftChildNode, onlyOrder),
-                    self._package(node._rightChildNode, onlyOrder)
+                    self._package(2 * index + 1, onlyOrder),
+                    self._package(2 * index + 2, onlyOrder)
                 ]
             else:
                 return {
                     Constants.BinaryNode.order: node._order,
                     Constants.BinaryNode.value: node._value,
-                    Constants.BinaryNode.leftChildNode: self._package(node._leftChildNode),
-                    Constants.BinaryNode.rightChildNode: self._package(node._rightChildNode)
+                    Constants.BinaryNode.leftChildNode: self._package(2 * index + 1),
+                    Constants.BinaryNode.rightChildNode: self._package(2 * index + 2)
                 }
 
+    def dump(self, fp: TextIO, onlyOrder: bool = False):
+        """
+        Write tree structure into file-like object as JSON, in the same structure as package.
+
+        Tree is written while it's walked without recursion, memory is proportional to tree height.
+
+        :param fp: File-like object with write method, e.g. a file opened in text mode.
+        :param onlyOrder: Write tree only contains order in each node if onlyOrder is True. Default is False.
+        :return: None.
+        """
+
+        _dumpTree(fp, self._heapList[0] if self._heapList else None, onlyOrder, self._heapList)
+
     def transform(self):
         """
         Transform heap struct from min heap to max heap/max heap to min heap.
@@ -629,9 +855,19 @@ class BinaryHeap:
             self._heapStruct = Constants.BinaryHeap.min
         elif self._heapStruct == Constants.BinaryHeap.min:
             self._heapStruct = Constants.BinaryHeap.max
-        if len(self._heapList) > 1:
-            for index in range(len(self._heapList) // 2 - 1, -1, -1):
-                self._swapDown(self._heapList[index])
+        self._heapify()
+
+    def _heapify(self):
+        """
+        Restore heap order of whole heap list bottom-up in O(n).
+
+        :return: None.
+        """
+
+        for index in range(len(self._heapList) // 2 - 1, -1, -1):
+            self._siftDown(index)
+        if not self._implicit:
+            self._linkAll()
 
     def merge(self, tree: 'BinaryHeap'):
         """
@@ -641,27 +877,19 @@ class BinaryHeap:
         :return: None.
         """
 
+        _checkNodeClass(tree._nodeClass, self._nodeClass)
         # Merge dict
-        for key in tree._heapDict.keys():
-            if key in self._heapDict:
-                self._heapDict[key] += tree._heapDict[key]
-            else:
-                self._heapDict[key] = tree._heapDict[key]
+        for bucket in tree._heapDict.values():
+            for node in bucket if type(bucket) is OrderedDict else (bucket,):
+                self._appendNodeIntoDict(node)
         # Merge list
         for node in tree._heapList:
-            self._heapList.append(node)
-            node._index = len(self._heapList) - 1
-            parentNode = self._heapList[-(node._index // -2) - 1]
-            if parentNode._leftChildNode:
-                parentNode._rightChildNode = node
-            else:
-                parentNode._leftChildNode = node
-            node._parentNode = parentNode
+            node._index = len(self._heapList)
+            node._parentNode = None
             node._leftChildNode = None
             node._rightChildNode = None
-        if len(self._heapList) > 1:
-            for index in range(len(self._heapList) // 2 - 1, -1, -1):
-                self._swapDown(self._heapList[index])
+            self._heapList.append(node)
+        self._heapify()
         tree._heapList.clear()
         tree._heapDict.clear()
 
@@ -3,11 +3,15 @@ Module of basic binary node.
 """
 
 from time import time
-from typing import Union, Any
+from typing import Union, Any, List, Iterable
 from .constants import Constants
+from ._util import _importNumpy
 
 
 class BinaryNode:
+    # Fixed attribute layout instead of a per-instance __dict__, nodes are created by the million.
+    __slots__ = ('_order', '_value', '_leftChildNode', '_rightChildNode', '_parentNode', '_index', '_inTree',
+                 '_height', '_size', '_duplicateNodes')
 
     def __init__(self, order: Union[float, int] = time(), value=None):
         """
@@ -23,8 +27,15 @@ class BinaryNode:
         self._leftChildNode: Union[BinaryNode, None] = None
         self._rightChildNode: Union[BinaryNode, None] = None
         self._parentNode: Union[BinaryNode, None] = None
+        # Position in heap list while node is in a binary heap. In a multiset binary search tree, sequence number
+        # of node in the bucket it's kept in. -1 if neither, each structure resets it when node leaves.
         self._index = -1
         self._inTree = False
+        # Height and node count of the subtree rooted at this node, maintained by the tree.
+        self._height = 0
+        self._size = 1
+        # Later nodes with the same order, kept on the node which is linked into a multiset tree.
+        self._duplicateNodes = None
 
     @property
     def order(self) -> Union[float, int]:
@@ -61,6 +72,52 @@ class BinaryNode:
         if type(order) not in (float, int):
             raise Exception('Type of order should be float or int')
 
+    @classmethod
+    def _sortedFromArray(cls, orders: Any, values: Union[Iterable[Any], None] = None) -> List['BinaryNode']:
+        """
+        Create nodes sorted by order from an order array. NumPy is required.
+
+        Orders are type checked once for the whole array instead of once per node. Nodes with same order keep their
+        original sequence.
+
+        :param orders: NumPy array or buffer-protocol object of orders.
+        :param values: Values in the same sequence as orders. All values are None if values is None.
+        :return: List of node.
+        """
+
+        numpy = _importNumpy('build tree from array')
+        orders = numpy.asarray(orders)
+        if orders.ndim != 1:
+            raise Exception('Orders should be a one-dimensional array')
+        if orders.dtype.kind not in 'iuf':
+            raise Exception('Type of order should be float or int')
+        if values is None:
+            values = [None] * len(orders)
+        else:
+            values = list(values)
+            if len(values) != len(orders):
+                raise Exception('Values should have the same length as orders')
+        sequence = numpy.argsort(orders, kind='stable')
+        orders = orders[sequence].tolist()
+        values = [values[index] for index in sequence.tolist()]
+        # Skip __init__, orders have been checked above.
+        new = cls.__new__
+        nodes = []
+        for order, value in zip(orders, values):
+            node = new(cls)
+            node._order = order
+            node._value = value
+            node._leftChildNode = None
+            node._rightChildNode = None
+            node._parentNode = None
+            node._index = -1
+            node._inTree = False
+            node._height = 0
+            node._size = 1
+            node._duplicateNodes = None
+            nodes.append(node)
+        return nodes
+
     def package(self) -> dict:
         """
         Package node information and return.
@@ -3,32 +3,197 @@ Module of binary search tree.
 """
 
 from .binaryNode import BinaryNode
-from typing import Union, List
+from .weakBinaryNode import _checkNodeClass
+from ._util import _pausedGarbageCollection, _exportOrders, _dumpTree
+from .frozenBinarySearchTree import FrozenBinarySearchTree
+from typing import Union, List, Iterable, Iterator, Tuple, Any, TextIO, Type
 from .constants import Constants
 from collections import deque
+from operator import attrgetter
+from heapq import merge
+from bisect import bisect_left, bisect_right
 
 
 class BinarySearchTree:
 
-    def __init__(self, node: Union[BinaryNode, None] = None):
+    def __init__(self, node: Union[BinaryNode, None] = None, balanced: bool = False, multiset: bool = False,
+                 nodeClass: Type[BinaryNode] = BinaryNode):
         """
         Module of binary search tree.
 
         :param node: Root node of tree.
+        :param balanced: Keep tree height in O(log n) by AVL rotations while inserting and deleting if balanced is True.
+        Default is False.
+        :param multiset: Store each distinct order once if multiset is True. Nodes with the same order are kept in a
+        bucket of the node linked into tree, by insertion sequence. Default is False.
+        :param nodeClass: Class of nodes which tree creates from (order, value) pairs and order arrays. Use
+        WeakBinaryNode to keep tree free of reference cycles, then every node of tree should be WeakBinaryNode.
+        Default is BinaryNode.
         """
 
+        self._nodeClass = nodeClass
         self._checkNodeConnection(node)
         self._rootNode: Union[BinaryNode, None] = node
+        self._balanced = balanced
+        self._multiset = multiset
         if node:
             node._inTree = True
+            node._height = 0
+            node._size = 1
 
     @property
     def rootNode(self) -> Union[BinaryNode, None]:
         return self._rootNode
 
+    @property
+    def balanced(self) -> bool:
+        return self._balanced
+
+    @property
+    def multiset(self) -> bool:
+        return self._multiset
+
+    @property
+    def nodeClass(self) -> Type[BinaryNode]:
+        return self._nodeClass
+
+    @classmethod
+    def fromIterable(cls, nodes: Iterable[Union[BinaryNode, Tuple[Union[float, int], Any]]],
+                     balanced: bool = False, multiset: bool = False,
+                     nodeClass: Type[BinaryNode] = BinaryNode) -> 'BinarySearchTree':
+        """
+        Build a balanced tree from nodes in one pass. Nodes will be sorted by order if they are not sorted yet.
+
+        Nodes with same order keep their original sequence.
+
+        :param nodes: Binary nodes or (order, value) pairs.
+        :param balanced: Balanced mode of the new tree. Default is False.
+        :param multiset: Multiset mode of the new tree. Default is False.
+        :param nodeClass: Node class of the new tree. Default is BinaryNode.
+        :return: New tree.
+        """
+
+        nodeList = cls._collectNodes(nodes, nodeClass)
+        if not cls._isSorted(nodeList):
+            nodeList.sort(key=attrgetter('_order'))
+        return cls._fromNodeList(nodeList, balanced, multiset, nodeClass)
+
+    @classmethod
+    def fromSorted(cls, nodes: Iterable[Union[BinaryNode, Tuple[Union[float, int], Any]]],
+                   balanced: bool = False, multiset: bool = False,
+                   nodeClass: Type[BinaryNode] = BinaryNode) -> 'BinarySearchTree':
+        """
+        Build a balanced tree from nodes which are already sorted by order.
+
+        :param nodes: Binary nodes or (order, value) pairs sorted by order.
+        :param balanced: Balanced mode of the new tree. Default is False.
+        :param multiset: Multiset mode of the new tree. Default is False.
+        :param nodeClass: Node class of the new tree. Default is BinaryNode.
+        :return: New tree.
+        """
+
+        nodeList = cls._collectNodes(nodes, nodeClass)
+        if not cls._isSorted(nodeList):
+            raise Exception('Nodes should be sorted by order')
+        return cls._fromNodeList(nodeList, balanced, multiset, nodeClass)
+
+    @classmethod
+    def fromArray(cls, orders: Any, values: Union[Iterable[Any], None] = None,
+                  balanced: bool = False, multiset: bool = False, pauseGc: bool = False,
+                  nodeClass: Type[BinaryNode] = BinaryNode) -> 'BinarySearchTree':
+        """
+        Build a balanced tree from an order array in one pass. NumPy is required.
+
+        Orders are type checked and sorted by NumPy. Nodes with same order keep their original sequence.
+
+        :param orders: NumPy array or buffer-protocol object of orders.
+        :param values: Values in the same sequence as orders. Default is None, all values are None.
+        :param balanced: Balanced mode of the new tree. Default is False.
+        :param multiset: Multiset mode of the new tree. Default is False.
+        :param pauseGc: Pause garbage collector while nodes are created if pauseGc is True. It's faster for a large
+        build, but garbage collector is paused for the whole process, other threads included. Default is False.
+        :param nodeClass: Node class of the new tree. Default is BinaryNode.
+        :return: New tree.
+        """
+
+        with _pausedGarbageCollection(pauseGc):
+            return cls._fromNodeList(nodeClass._sortedFromArray(orders, values), balanced, multiset, nodeClass)
+
+    @staticmethod
+    def _collectNodes(nodes: Iterable[Union[BinaryNode, Tuple[Union[float, int], Any]]],
+                      nodeClass: Type[BinaryNode]) -> List[BinaryNode]:
+        """
+        Collect nodes into a list. (order, value) pairs will be converted into nodes of giving class.
+
+        :param nodes: Binary nodes or (order, value) pairs.
+        :param nodeClass: Node class of tree.
+        :return: List of node.
+        """
+
+        nodeList = []
+        for node in nodes:
+            if isinstance(node, BinaryNode):
+                if node._inTree:
+                    raise Exception('Node is already in other tree')
+                _checkNodeClass(type(node), nodeClass)
+                nodeList.append(node)
+            else:
+                order, value = node
+                nodeList.append(nodeClass(order, value))
+        return nodeList
+
+    @staticmethod
+    def _isSorted(nodeList: List[BinaryNode]) -> bool:
+        """
+        Check whether nodes are sorted by order.
+
+        :param nodeList: List of node.
+        :return: Boolean.
+        """
+
+        for i in range(1, len(nodeList)):
+            if nodeList[i - 1]._order > nodeList[i]._order:
+                return False
+        return True
+
+    @classmethod
+    def _fromNodeList(cls, nodeList: List[BinaryNode], balanced: bool, multiset: bool,
+                      nodeClass: Type[BinaryNode]) -> 'BinarySearchTree':
+        """
+        Build tree from sorted list of node.
+
+        :param nodeList: List of node sorted by order.
+        :param balanced: Balanced mode of the new tree.
+        :param multiset: Multiset mode of the new tree.
+        :param nodeClass: Node class of the new tree.
+        :return: New tree.
+        """
+
+        cls._markNodes(nodeList)
+        tree = cls(balanced=balanced, multiset=multiset, nodeClass=nodeClass)
+        tree._rootNode = tree._buildFromSorted(iter(nodeList), len(nodeList))
+        return tree
+
+    @staticmethod
+    def _markNodes(nodeList: List[BinaryNode]):
+        """
+        Mark nodes as in tree. Nothing is marked if any node is already in tree.
+
+        :param nodeList: List of node.
+        :return: None.
+        """
+
+        for i, node in enumerate(nodeList):
+            # The same node may appear twice in list.
+            if node._inTree:
+                for j in range(i):
+                    nodeList[j]._inTree = False
+                raise Exception('Node is already in other tree')
+            node._inTree = True
+
     def _checkNodeConnection(self, node: Union[BinaryNode, None] = None):
         """
-        Check whether node is already in another tree.
+        Check whether node is already in another tree, and whether it can be linked with nodes of this tree.
 
         :param node: Binary node to check.
         :return: None.
@@ -37,6 +202,7 @@ class BinarySearchTree:
         if node:
             if node._inTree:
                 raise Exception('Node is already in other tree')
+            _checkNodeClass(type(node), self._nodeClass)
 
     def insertNode(self, node: BinaryNode):
         """
@@ -48,25 +214,261 @@ class BinarySearchTree:
 
         self._checkNodeConnection(node)
         node._inTree = True
+        # Node is linked unless it's put into a bucket.
+        node._index = -1
         if not self._rootNode:
             self._rootNode = node
         else:
-            iterNode = self._rootNode
-            while iterNode:
-                if iterNode._order > node._order:
-                    if iterNode._leftChildNode:
-                        iterNode = iterNode._leftChildNode
-                    else:
-                        iterNode._leftChildNode = node
-                        iterNode._leftChildNode._parentNode = iterNode
-                        break
+            self._insertUnder(self._rootNode, node)
+
+    def _insertUnder(self, iterNode: BinaryNode, node: BinaryNode):
+        """
+        Insert node by descending from a node in tree.
+
+        :param iterNode: Node in tree whose subtree covers the position of new node.
+        :param node: node that will be joined.
+        :return: None.
+        """
+
+        while iterNode:
+            if self._multiset and iterNode._order == node._order:
+                self._appendIntoBucket(iterNode, node)
+                break
+            elif iterNode._order > node._order:
+                if iterNode._leftChildNode:
+                    iterNode = iterNode._leftChildNode
                 else:
-                    if iterNode._rightChildNode:
-                        iterNode = iterNode._rightChildNode
-                    else:
-                        iterNode._rightChildNode = node
-                        iterNode._rightChildNode._parentNode = iterNode
-                        break
+                    iterNode._leftChildNode = node
+                    iterNode._leftChildNode._parentNode = iterNode
+                    break
+            else:
+                if iterNode._rightChildNode:
+                    iterNode = iterNode._rightChildNode
+                else:
+                    iterNode._rightChildNode = node
+                    iterNode._rightChildNode._parentNode = iterNode
+                    break
+        self._rootNode = self._retrace(iterNode)
+
+    def insertMany(self, nodes: Iterable[Union[BinaryNode, Tuple[Union[float, int], Any]]]):
+        """
+        Insert a batch of nodes into tree.
+
+        Batch is sorted once and walked down the tree together. Each tree node splits the batch range it receives by
+        binary search, so a node on the path of many new nodes is compared once instead of once per new node. A range
+        reaching an empty child is built into a balanced subtree, then visited nodes are joined back bottom-up.
+        A large batch is merged with the tree and the tree is rebuilt in O(n + k) instead.
+
+        :param nodes: Binary nodes or (order, value) pairs.
+        :return: None.
+        """
+
+        nodeList = self._collectNodes(nodes, self._nodeClass)
+        if not self._isSorted(nodeList):
+            nodeList.sort(key=attrgetter('_order'))
+        self._markNodes(nodeList)
+        count = self._nodeCount(self._rootNode)
+        # Tree grows while the batch is inserted, compare with the final size, or an empty tree never rebuilds.
+        if self._isLargeBatch(len(nodeList), count + len(nodeList)) or not self._rootNode:
+            # Nodes already in tree go first if orders are the same.
+            orderedNodes = merge(self._iterAllNodes(self._rootNode), iter(nodeList), key=attrgetter('_order'))
+            self._rootNode = self._buildFromSorted(orderedNodes, count + len(nodeList))
+            return
+        orders = [node._order for node in nodeList]
+        stk = [(self._rootNode, 0, len(nodeList))]
+        visitedNodes = []
+        while stk:
+            iterNode, lo, hi = stk.pop()
+            visitedNodes.append(iterNode)
+            # New nodes with the same order go right, as insertNode does.
+            mid = end = bisect_left(orders, iterNode._order, lo, hi)
+            if self._multiset and mid < hi and orders[mid] == iterNode._order:
+                end = bisect_right(orders, iterNode._order, mid, hi)
+                for i in range(mid, end):
+                    self._appendIntoBucket(iterNode, nodeList[i])
+            if lo < mid:
+                if iterNode._leftChildNode:
+                    stk.append((iterNode._leftChildNode, lo, mid))
+                else:
+                    iterNode._leftChildNode = self._buildFromSorted(iter(nodeList[lo:mid]), mid - lo)
+                    iterNode._leftChildNode._parentNode = iterNode
+            if end < hi:
+                if iterNode._rightChildNode:
+                    stk.append((iterNode._rightChildNode, end, hi))
+                else:
+                    iterNode._rightChildNode = self._buildFromSorted(iter(nodeList[end:hi]), hi - end)
+                    iterNode._rightChildNode._parentNode = iterNode
+        self._rejoinNodes(visitedNodes, {})
+
+    def deleteMany(self, orders: Iterable[Union[float, int]]) -> List[BinaryNode]:
+        """
+        Delete a batch of nodes by order. Each order deletes one node.
+
+        Orders are sorted once and walked down the tree together like insertMany, then visited nodes are joined back
+        bottom-up without the removed ones. A large batch is removed by walking the tree once and the tree is rebuilt
+        in O(n + k) instead.
+
+        :param orders: Orders of nodes that will be deleted.
+        :return: Nodes that be removed, sorted by order. Orders which do not exist in tree are skipped.
+        """
+
+        orderList = sorted(orders)
+        removedNodes = []
+        count = self._nodeCount(self._rootNode)
+        if self._isLargeBatch(len(orderList), count):
+            nodeList = []
+            i = 0
+            for node in self._iterAllNodes(self._rootNode):
+                while i < len(orderList) and orderList[i] < node._order:
+                    i += 1
+                if i < len(orderList) and orderList[i] == node._order:
+                    removedNodes.append(node)
+                    i += 1
+                else:
+                    nodeList.append(node)
+            self._rootNode = self._buildFromSorted(iter(nodeList), len(nodeList))
+            for node in removedNodes:
+                self._resetNode(node)
+            return removedNodes
+        if not self._rootNode or not orderList:
+            return removedNodes
+        orderCounts = {}
+        for order in orderList:
+            orderCounts[order] = orderCounts.get(order, 0) + 1
+        stk = [(self._rootNode, 0, len(orderList))]
+        visitedNodes = []
+        # Removed node and the node taking its place, None if the place is left to join.
+        replacedNodes = {}
+        while stk:
+            iterNode, lo, hi = stk.pop()
+            visitedNodes.append(iterNode)
+            order = iterNode._order
+            mid = end = bisect_left(orderList, order, lo, hi)
+            if mid < hi and orderList[mid] == order:
+                end = bisect_right(orderList, order, mid, hi)
+            if mid < end and orderCounts[order]:
+                removedNodes.append(iterNode)
+                orderCounts[order] -= 1
+                duplicateNodes = iterNode._duplicateNodes
+                while orderCounts[order] and duplicateNodes:
+                    removedNodes.append(duplicateNodes.popleft())
+                    orderCounts[order] -= 1
+                if duplicateNodes:
+                    newNode = duplicateNodes.popleft()
+                    newNode._index = -1
+                    newNode._duplicateNodes = duplicateNodes if duplicateNodes else None
+                    replacedNodes[iterNode] = newNode
+                else:
+                    replacedNodes[iterNode] = None
+                if orderCounts[order] and not self._multiset:
+                    # Other nodes with the same order may be on both sides.
+                    mid, end = end, mid
+            if lo < mid and iterNode._leftChildNode:
+                stk.append((iterNode._leftChildNode, lo, mid))
+            if end < hi and iterNode._rightChildNode:
+                stk.append((iterNode._rightChildNode, end, hi))
+        self._rejoinNodes(visitedNodes, replacedNodes)
+        for node in removedNodes:
+            self._resetNode(node)
+        removedNodes.sort(key=attrgetter('_order'))
+        return removedNodes
+
+    def _rejoinNodes(self, visitedNodes: List[BinaryNode], replacedNodes: dict):
+        """
+        Join each visited node with its children again, children before parents, and relink it into its parent.
+
+        Only visited nodes may have changed subtrees, and parents of visited nodes are visited as well.
+
+        :param visitedNodes: Visited nodes, each one after its parent.
+        :param replacedNodes: Removed node and the node taking its place, None if there's no one.
+        :return: None.
+        """
+
+        for node in reversed(visitedNodes):
+            leftNode = node._leftChildNode
+            rightNode = node._rightChildNode
+            leftHeight = leftNode._height if leftNode else -1
+            rightHeight = rightNode._height if rightNode else -1
+            if node not in replacedNodes and (not self._balanced or -1 <= leftHeight - rightHeight <= 1):
+                # Still balanced, node keeps its place and only bookkeeping is refreshed. Same as _refreshNode,
+                # inlined since most visited nodes end here.
+                node._height = max(leftHeight, rightHeight) + 1
+                node._size = (leftNode._size if leftNode else 0) + (rightNode._size if rightNode else 0) + 1
+                if node._duplicateNodes:
+                    node._size += len(node._duplicateNodes)
+                continue
+            parentNode = node._parentNode
+            if leftNode:
+                leftNode._parentNode = None
+            if rightNode:
+                rightNode._parentNode = None
+            if node in replacedNodes:
+                centerNode = replacedNodes[node]
+                if centerNode:
+                    subNode = self._joinNodes(leftNode, centerNode, rightNode)
+                else:
+                    subNode = self._joinNodes2(leftNode, rightNode)
+            else:
+                subNode = self._joinNodes(leftNode, node, rightNode)
+            if subNode:
+                subNode._parentNode = parentNode
+            if not parentNode:
+                self._rootNode = subNode
+            elif parentNode._leftChildNode == node:
+                parentNode._leftChildNode = subNode
+            else:
+                parentNode._rightChildNode = subNode
+
+    def deleteRange(self, lo: Union[float, int], hi: Union[float, int]) -> List[BinaryNode]:
+        """
+        Delete all nodes whose order is between lo and hi (both inclusive).
+
+        The range is cut out by splitting tree twice and the rest are joined back, so time complexity is O(log n + k)
+        in balanced mode.
+
+        :param lo: Lower bound of order.
+        :param hi: Upper bound of order.
+        :return: Nodes that be removed, sorted by order.
+        """
+
+        if lo > hi or not self._rootNode:
+            return []
+        lessNode, rightNode = self._splitNodes(self._rootNode, lo, False)
+        rangeNode, greaterNode = self._splitNodes(rightNode, hi, True)
+        self._rootNode = self._joinNodes2(lessNode, greaterNode)
+        removedNodes = list(self._iterAllNodes(rangeNode))
+        for node in removedNodes:
+            self._resetNode(node)
+        return removedNodes
+
+    def _isLargeBatch(self, batchCount: int, count: int) -> bool:
+        """
+        Check whether a batch is large enough that rebuilding tree is cheaper than O(log n) operation for each node.
+
+        :param batchCount: Nodes number in batch.
+        :param count: Nodes number in tree.
+        :return: Boolean.
+        """
+
+        return batchCount * count.bit_length() > count + batchCount
+
+    def _searchUnder(self, iterNode: Union[BinaryNode, None], order: Union[float, int]) -> Union[BinaryNode, None]:
+        """
+        Search a node with giving order by descending from a node in tree.
+
+        :param iterNode: Node in tree to start with.
+        :param order: Node order.
+        :return: Node with giving order. Return None if there's no node with giving order in subtree.
+        """
+
+        while iterNode:
+            if iterNode._order == order:
+                return iterNode
+            elif iterNode._order > order:
+                iterNode = iterNode._leftChildNode
+            else:
+                iterNode = iterNode._rightChildNode
+        return None
 
     def deleteNode(self, order: Union[float, int]) -> Union[BinaryNode, None]:
         """
@@ -76,89 +478,239 @@ class BinarySearchTree:
         :return: The node that be removed. Return None if there's no node with giving order.
         """
 
-        if not self._rootNode:
-            return None
+        node = self._searchUnder(self._rootNode, order)
+        if node:
+            self._removeNode(node)
+        return node
+
+    def _removeNode(self, iterNode: BinaryNode):
+        """
+        Unlink a node from tree and reset its connection.
+
+        :param iterNode: Node in tree that will be removed.
+        :return: None.
+        """
+
+        if iterNode._duplicateNodes:
+            self._promoteDuplicate(iterNode)
+            return
+        # Lowest node whose subtree is changed by the removal.
+        retraceNode = iterNode._parentNode
+        if not iterNode._leftChildNode and not iterNode._rightChildNode:
+            if iterNode._parentNode:
+                if iterNode._parentNode._leftChildNode == iterNode:
+                    iterNode._parentNode._leftChildNode = None
+                else:
+                    iterNode._parentNode._rightChildNode = None
+            else:
+                self._rootNode = None
+        elif iterNode._leftChildNode and not iterNode._rightChildNode:
+            if iterNode._parentNode:
+                if iterNode._parentNode._leftChildNode == iterNode:
+                    iterNode._parentNode._leftChildNode = iterNode._leftChildNode
+                else:
+                    iterNode._parentNode._rightChildNode = iterNode._leftChildNode
+            else:
+                self._rootNode = iterNode._leftChildNode
+            iterNode._leftChildNode._parentNode = iterNode._parentNode
+        elif not iterNode._leftChildNode and iterNode._rightChildNode:
+            if iterNode._parentNode:
+                if iterNode._parentNode._leftChildNode == iterNode:
+                    iterNode._parentNode._leftChildNode = iterNode._rightChildNode
+                else:
+                    iterNode._parentNode._rightChildNode = iterNode._rightChildNode
+            else:
+                self._rootNode = iterNode._rightChildNode
+            iterNode._rightChildNode._parentNode = iterNode._parentNode
         else:
-            iterNode = self._rootNode
-            while iterNode:
-                if iterNode._order == order:
-                    if not iterNode._leftChildNode and not iterNode._rightChildNode:
-                        if iterNode._parentNode:
-                            if iterNode._parentNode._leftChildNode == iterNode:
-                                iterNode._parentNode._leftChildNode = None
-                            else:
-                                iterNode._parentNode._rightChildNode = None
-                        else:
-                            self._rootNode = None
-                    elif iterNode._leftChildNode and not iterNode._rightChildNode:
-                        if iterNode._parentNode:
-                            if iterNode._parentNode._leftChildNode == iterNode:
-                                iterNode._parentNode._leftChildNode = iterNode._leftChildNode
-                            else:
-                                iterNode._parentNode._rightChildNode = iterNode._leftChildNode
-                        else:
-                            self._rootNode = iterNode._leftChildNode
-                        iterNode._leftChildNode._parentNode = iterNode._parentNode
-                    elif not iterNode._leftChildNode and iterNode._rightChildNode:
-                        if iterNode._parentNode:
-                            if iterNode._parentNode._leftChildNode == iterNode:
-                                iterNode._parentNode._leftChildNode = iterNode._rightChildNode
-                            else:
-                                iterNode._parentNode._rightChildNode = iterNode._rightChildNode
-                        else:
-                            self._rootNode = iterNode._rightChildNode
-                        iterNode._rightChildNode._parentNode = iterNode._parentNode
-                    else:
-                        maxNodeInLeft = iterNode._leftChildNode
-                        if not maxNodeInLeft._rightChildNode:
-                            if iterNode._parentNode:
-                                if iterNode._parentNode._leftChildNode == iterNode:
-                                    iterNode._parentNode._leftChildNode = maxNodeInLeft
-                                else:
-                                    iterNode._parentNode._rightChildNode = maxNodeInLeft
-                            else:
-                                self._rootNode = maxNodeInLeft
-                            maxNodeInLeft._parentNode = iterNode._parentNode
-                            maxNodeInLeft._rightChildNode = iterNode._rightChildNode
-                            iterNode._rightChildNode._parentNode = maxNodeInLeft
-                        else:
-                            while maxNodeInLeft:
-                                if maxNodeInLeft._rightChildNode:
-                                    maxNodeInLeft = maxNodeInLeft._rightChildNode
-                                else:
-                                    break
-
-                            maxNodeInLeft._parentNode._rightChildNode = maxNodeInLeft._leftChildNode
-                            if maxNodeInLeft._leftChildNode:
-                                maxNodeInLeft._leftChildNode._parentNode = maxNodeInLeft._parentNode
-
-                            if iterNode._parentNode:
-                                if iterNode._parentNode._leftChildNode == iterNode:
-                                    iterNode._parentNode._leftChildNode = maxNodeInLeft
-                                else:
-                                    iterNode._parentNode._rightChildNode = maxNodeInLeft
-                            else:
-                                self._rootNode = maxNodeInLeft
-                            maxNodeInLeft._parentNode = iterNode._parentNode
-                            maxNodeInLeft._leftChildNode = iterNode._leftChildNode
-                            maxNodeInLeft._rightChildNode = iterNode._rightChildNode
-                            iterNode._leftChildNode._parentNode = maxNodeInLeft
-                            iterNode._rightChildNode._parentNode = maxNodeInLeft
-                    iterNode._leftChildNode = None
-                    iterNode._rightChildNode = None
-                    iterNode._parentNode = None
-                    iterNode._inTree = False
-                    return iterNode
-                elif iterNode._order > order:
-                    if iterNode._leftChildNode:
-                        iterNode = iterNode._leftChildNode
+            maxNodeInLeft = iterNode._leftChildNode
+            if not maxNodeInLeft._rightChildNode:
+                if iterNode._parentNode:
+                    if iterNode._parentNode._leftChildNode == iterNode:
+                        iterNode._parentNode._leftChildNode = maxNodeInLeft
                     else:
-                        return None
+                        iterNode._parentNode._rightChildNode = maxNodeInLeft
                 else:
-                    if iterNode._rightChildNode:
-                        iterNode = iterNode._rightChildNode
+                    self._rootNode = maxNodeInLeft
+                maxNodeInLeft._parentNode = iterNode._parentNode
+                maxNodeInLeft._rightChildNode = iterNode._rightChildNode
+                iterNode._rightChildNode._parentNode = maxNodeInLeft
+                retraceNode = maxNodeInLeft
+            else:
+                while maxNodeInLeft:
+                    if maxNodeInLeft._rightChildNode:
+                        maxNodeInLeft = maxNodeInLeft._rightChildNode
+                    else:
+                        break
+
+                retraceNode = maxNodeInLeft._parentNode
+                maxNodeInLeft._parentNode._rightChildNode = maxNodeInLeft._leftChildNode
+                if maxNodeInLeft._leftChildNode:
+                    maxNodeInLeft._leftChildNode._parentNode = maxNodeInLeft._parentNode
+
+                if iterNode._parentNode:
+                    if iterNode._parentNode._leftChildNode == iterNode:
+                        iterNode._parentNode._leftChildNode = maxNodeInLeft
                     else:
-                        return None
+                        iterNode._parentNode._rightChildNode = maxNodeInLeft
+                else:
+                    self._rootNode = maxNodeInLeft
+                maxNodeInLeft._parentNode = iterNode._parentNode
+                maxNodeInLeft._leftChildNode = iterNode._leftChildNode
+                maxNodeInLeft._rightChildNode = iterNode._rightChildNode
+                iterNode._leftChildNode._parentNode = maxNodeInLeft
+                iterNode._rightChildNode._parentNode = maxNodeInLeft
+            # Replacement node takes over the bookkeeping of removed node before retracing.
+            maxNodeInLeft._height = iterNode._height
+            maxNodeInLeft._size = iterNode._size
+        self._resetNode(iterNode)
+        if retraceNode:
+            self._rootNode = self._retrace(retraceNode)
+
+    def _promoteDuplicate(self, node: BinaryNode) -> BinaryNode:
+        """
+        Unlink a node from multiset tree and put the first node of its bucket at its place.
+
+        :param node: Node in tree which has nodes with the same order.
+        :return: The node that takes the place.
+        """
+
+        duplicateNodes = node._duplicateNodes
+        newNode = duplicateNodes.popleft()
+        newNode._index = -1
+        newNode._duplicateNodes = duplicateNodes if duplicateNodes else None
+        if node._parentNode:
+            if node._parentNode._leftChildNode == node:
+                node._parentNode._leftChildNode = newNode
+            else:
+                node._parentNode._rightChildNode = newNode
+        else:
+            self._rootNode = newNode
+        newNode._parentNode = node._parentNode
+        self._linkChildren(newNode, node._leftChildNode, node._rightChildNode)
+        self._resetNode(node)
+        self._rootNode = self._retrace(newNode)
+        return newNode
+
+    def _resetNode(self, node: BinaryNode):
+        """
+        Reset connection and bookkeeping of node which leaves the tree.
+
+        :param node: Binary node.
+        :return: None.
+        """
+
+        node._leftChildNode = None
+        node._rightChildNode = None
+        node._parentNode = None
+        node._inTree = False
+        node._index = -1
+        node._height = 0
+        node._size = 1
+        node._duplicateNodes = None
+
+    def _refreshNode(self, node: BinaryNode):
+        """
+        Recalculate height and node count bookkeeping of node from its children.
+
+        :param node: Binary node.
+        :return: None.
+        """
+
+        node._height = max(self._height(node._leftChildNode), self._height(node._rightChildNode)) + 1
+        node._size = self._nodeCount(node._leftChildNode) + self._nodeCount(node._rightChildNode) + 1
+        if node._duplicateNodes:
+            node._size += len(node._duplicateNodes)
+
+    def _rotateLeft(self, node: BinaryNode) -> BinaryNode:
+        """
+        Rotate subtree left. Right child of node becomes the root of subtree.
+
+        :param node: Root node of subtree.
+        :return: New root node of subtree.
+        """
+
+        pivotNode = node._rightChildNode
+        node._rightChildNode = pivotNode._leftChildNode
+        if pivotNode._leftChildNode:
+            pivotNode._leftChildNode._parentNode = node
+        pivotNode._parentNode = node._parentNode
+        if node._parentNode:
+            if node._parentNode._leftChildNode == node:
+                node._parentNode._leftChildNode = pivotNode
+            else:
+                node._parentNode._rightChildNode = pivotNode
+        pivotNode._leftChildNode = node
+        node._parentNode = pivotNode
+        self._refreshNode(node)
+        self._refreshNode(pivotNode)
+        return pivotNode
+
+    def _rotateRight(self, node: BinaryNode) -> BinaryNode:
+        """
+        Rotate subtree right. Left child of node becomes the root of subtree.
+
+        :param node: Root node of subtree.
+        :return: New root node of subtree.
+        """
+
+        pivotNode = node._leftChildNode
+        node._leftChildNode = pivotNode._rightChildNode
+        if pivotNode._rightChildNode:
+            pivotNode._rightChildNode._parentNode = node
+        pivotNode._parentNode = node._parentNode
+        if node._parentNode:
+            if node._parentNode._leftChildNode == node:
+                node._parentNode._leftChildNode = pivotNode
+            else:
+                node._parentNode._rightChildNode = pivotNode
+        pivotNode._rightChildNode = node
+        node._parentNode = pivotNode
+        self._refreshNode(node)
+        self._refreshNode(pivotNode)
+        return pivotNode
+
+    def _rebalanceNode(self, node: BinaryNode) -> BinaryNode:
+        """
+        Refresh node and rotate its subtree if the heights of both sides differ by more than one.
+
+        Rotation only happens in balanced mode.
+
+        :param node: Root node of subtree.
+        :return: New root node of subtree.
+        """
+
+        self._refreshNode(node)
+        if not self._balanced:
+            return node
+        balanceFactor = self._height(node._leftChildNode) - self._height(node._rightChildNode)
+        if balanceFactor > 1:
+            leftNode = node._leftChildNode
+            if self._height(leftNode._leftChildNode) < self._height(leftNode._rightChildNode):
+                self._rotateLeft(leftNode)
+            return self._rotateRight(node)
+        elif balanceFactor < -1:
+            rightNode = node._rightChildNode
+            if self._height(rightNode._rightChildNode) < self._height(rightNode._leftChildNode):
+                self._rotateRight(rightNode)
+            return self._rotateLeft(node)
+        return node
+
+    def _retrace(self, node: BinaryNode) -> BinaryNode:
+        """
+        Walk from node up to the root, refresh bookkeeping and rebalance each node on the way.
+
+        Node count changes along the whole path, so the walk always reaches the root.
+
+        :param node: Lowest node whose subtree is changed.
+        :return: Root node of tree.
+        """
+
+        while True:
+            node = self._rebalanceNode(node)
+            if not node._parentNode:
+                return node
+            node = node._parentNode
 
     def height(self) -> int:
         """
@@ -185,20 +737,7 @@ class BinarySearchTree:
         :return: Tree height.
         """
 
-        height = -1
-        if not rootNode:
-            return height
-        q = deque()
-        q.append(rootNode)
-        while len(q):
-            height += 1
-            for i in range(len(q)):
-                node = q.popleft()
-                if node._leftChildNode:
-                    q.append(node._leftChildNode)
-                if node._rightChildNode:
-                    q.append(node._rightChildNode)
-        return height
+        return rootNode._height if rootNode else -1
 
     def nodeCount(self) -> int:
         """
@@ -217,20 +756,7 @@ class BinarySearchTree:
         :return: Nodes number in tree.
         """
 
-        count = 0
-        if not rootNode:
-            return count
-        q = deque()
-        q.append(rootNode)
-        while len(q):
-            count += len(q)
-            for i in range(len(q)):
-                node = q.popleft()
-                if node._leftChildNode:
-                    q.append(node._leftChildNode)
-                if node._rightChildNode:
-                    q.append(node._rightChildNode)
-        return count
+        return rootNode._size if rootNode else 0
 
     def orderedList(self, onlyOrder: bool = False) -> List[Union[BinaryNode, float, int]]:
         """
@@ -264,11 +790,121 @@ class BinarySearchTree:
             node = stk.pop()
             if onlyOrder:
                 orderedList.append(node._order)
+                if node._duplicateNodes:
+                    orderedList.extend([node._order] * len(node._duplicateNodes))
             else:
                 orderedList.append(node)
+                if node._duplicateNodes:
+                    orderedList.extend(node._duplicateNodes)
             node = node._rightChildNode
         return orderedList
 
+    def exportOrders(self, out: Any = None, typecode: str = 'd') -> Any:
+        """
+        Write sorted orders into a typed buffer without building a list.
+
+        :param out: Writable one-dimensional buffer, e.g. array.array or numpy.ndarray, whose length is node count.
+        Default is None, a new array.array is created.
+        :param typecode: Typecode of new array if out is None. 'd' for float orders and 'q' for int orders. Default is
+        'd'.
+        :return: Buffer with sorted orders. It's out if out is given.
+        """
+
+        return _exportOrders(map(attrgetter('_order'), self._iterAllNodes(self._rootNode)), self.nodeCount(), out,
+                             typecode)
+
+    def __iter__(self) -> Iterator[BinaryNode]:
+        """
+        Iterate nodes by order lazily.
+
+        Memory is proportional to tree height. Tree should not be modified during iteration.
+
+        :return: Iterator of node.
+        """
+
+        return self._iterAllNodes(self._rootNode)
+
+    def __reversed__(self) -> Iterator[BinaryNode]:
+        """
+        Iterate nodes by descending order lazily.
+
+        Memory is proportional to tree height. Tree should not be modified during iteration.
+
+        :return: Iterator of node.
+        """
+
+        return self._iterAllNodesReversed(self._rootNode)
+
+    def iterFrom(self, order: Union[float, int]) -> Iterator[BinaryNode]:
+        """
+        Iterate nodes by order lazily, starting from the first node whose order is greater than or equal to giving
+        order.
+
+        Memory is proportional to tree height. Tree should not be modified during iteration.
+
+        :param order: Node order.
+        :return: Iterator of node.
+        """
+
+        stk = deque()
+        iterNode = self._rootNode
+        while iterNode:
+            if iterNode._order >= order:
+                stk.append(iterNode)
+                iterNode = iterNode._leftChildNode
+            else:
+                iterNode = iterNode._rightChildNode
+        return self._expandNodes(self._iterNodes(None, stk))
+
+    def range(self, lo: Union[float, int], hi: Union[float, int]) -> Iterator[BinaryNode]:
+        """
+        Iterate nodes whose order is between lo and hi (both inclusive) by order lazily.
+
+        Only the path to lo and the nodes in range are visited, so time complexity is O(log n + k).
+
+        :param lo: Lower bound of order.
+        :param hi: Upper bound of order.
+        :return: Iterator of node.
+        """
+
+        for node in self.iterFrom(lo):
+            if node._order > hi:
+                break
+            yield node
+
+    def countRange(self, lo: Union[float, int], hi: Union[float, int]) -> int:
+        """
+        Count nodes whose order is between lo and hi (both inclusive).
+
+        :param lo: Lower bound of order.
+        :param hi: Upper bound of order.
+        :return: Nodes number in range.
+        """
+
+        if lo > hi:
+            return 0
+        return self._countLess(hi, True) - self._countLess(lo, False)
+
+    def _countLess(self, order: Union[float, int], inclusive: bool = False) -> int:
+        """
+        Count nodes whose order is less than giving order.
+
+        :param order: Node order.
+        :param inclusive: Count nodes with same order as well if inclusive is True. Default is False.
+        :return: Nodes number.
+        """
+
+        count = 0
+        iterNode = self._rootNode
+        while iterNode:
+            if iterNode._order < order or (inclusive and iterNode._order == order):
+                # Node count of left subtree plus the node itself and its bucket.
+                count += iterNode._size - self._nodeCount(iterNode._rightChildNode)
+                iterNode = iterNode._rightChildNode
+            else:
+                iterNode = iterNode._leftChildNode
+        return count
+
     def getNodeByOrder(self, order: Union[float, int]) -> Union[BinaryNode, None]:
         """
         Search a node with giving order.
@@ -277,23 +913,18 @@ class BinarySearchTree:
         :return: Node with giving order. Return None if there's no node with giving order.
         """
 
-        if not self._rootNode:
-            return None
-        else:
-            iterNode = self._rootNode
-            while iterNode:
-                if iterNode._order == order:
-                    while iterNode._leftChildNode:
-                        if iterNode._leftChildNode._order == order:
-                            iterNode = iterNode._leftChildNode
-                        else:
-                            break
-                    return iterNode
-                elif iterNode._order > order:
-                    iterNode = iterNode._leftChildNode
-                else:
-                    iterNode = iterNode._rightChildNode
-            return None
+        # Rotations can move nodes with same order to any side, keep searching left for the first one.
+        resultNode = None
+        iterNode = self._rootNode
+        while iterNode:
+            if iterNode._order == order:
+                resultNode = iterNode
+                iterNode = iterNode._leftChildNode
+            elif iterNode._order > order:
+                iterNode = iterNode._leftChildNode
+            else:
+                iterNode = iterNode._rightChildNode
+        return resultNode
 
     def getRankByOrder(self, order: Union[float, int]) -> int:
         """
@@ -309,13 +940,7 @@ class BinarySearchTree:
         if not node:
             return -1
         else:
-            rank = self._nodeCount(node._leftChildNode) + 1
-            iterNode = node
-            while iterNode._parentNode:
-                if iterNode._parentNode._rightChildNode == iterNode:
-                    rank += self._nodeCount(iterNode._parentNode._leftChildNode) + 1
-                iterNode = iterNode._parentNode
-            return rank - 1
+            return self._countLess(order)
 
     def getNodeByRank(self, rank: int) -> Union[BinaryNode, None]:
         """
@@ -327,33 +952,207 @@ class BinarySearchTree:
 
         if rank < 0:
             return None
-        stk = deque()
         node = self._rootNode
-        while node or len(stk):
-            while node:
-                stk.append(node)
+        while node:
+            leftCount = self._nodeCount(node._leftChildNode)
+            if rank < leftCount:
                 node = node._leftChildNode
-            node = stk.pop()
-            rank -= 1
-            if rank < 0:
+            elif rank == leftCount:
                 return node
-            node = node._rightChildNode
+            elif node._duplicateNodes and rank <= leftCount + len(node._duplicateNodes):
+                return node._duplicateNodes[rank - leftCount - 1]
+            else:
+                rank -= node._size - self._nodeCount(node._rightChildNode)
+                node = node._rightChildNode
         return None
 
-    def maxNode(self) -> Union[BinaryNode, None]:
+    def floorNode(self, order: Union[float, int]) -> Union[BinaryNode, None]:
         """
-        Get max order node in tree.
+        Get the last node whose order is less than or equal to giving order.
 
-        :return: Max order node in tree. Return None if tree is empty.
+        :param order: Node order.
+        :return: Node in tree. Return None if there's no such node.
         """
 
-        if not self._rootNode:
-            return None
-        else:
-            iterNode = self._rootNode
-            while iterNode:
-                if iterNode._rightChildNode:
+        return self._lastNodeBefore(order, True)
+
+    def ceilingNode(self, order: Union[float, int]) -> Union[BinaryNode, None]:
+        """
+        Get the first node whose order is greater than or equal to giving order.
+
+        :param order: Node order.
+        :return: Node in tree. Return None if there's no such node.
+        """
+
+        return self._firstNodeAfter(order, True)
+
+    def predecessorNode(self, order: Union[float, int]) -> Union[BinaryNode, None]:
+        """
+        Get the last node whose order is less than giving order.
+
+        :param order: Node order.
+        :return: Node in tree. Return None if there's no such node.
+        """
+
+        return self._lastNodeBefore(order, False)
+
+    def successorNode(self, order: Union[float, int]) -> Union[BinaryNode, None]:
+        """
+        Get the first node whose order is greater than giving order.
+
+        :param order: Node order.
+        :return: Node in tree. Return None if there's no such node.
+        """
+
+        return self._firstNodeAfter(order, False)
+
+    def _lastNodeBefore(self, order: Union[float, int], inclusive: bool) -> Union[BinaryNode, None]:
+        """
+        Get the last node whose order is less than giving order.
+
+        :param order: Node order.
+        :param inclusive: Accept node with same order as well if inclusive is True.
+        :return: Node in tree. Return None if there's no such node.
+        """
+
+        resultNode = None
+        iterNode = self._rootNode
+        while iterNode:
+            if iterNode._order < order or (inclusive and iterNode._order == order):
+                resultNode = iterNode
+                iterNode = iterNode._rightChildNode
+            else:
+                iterNode = iterNode._leftChildNode
+        if resultNode and resultNode._duplicateNodes:
+            return resultNode._duplicateNodes[-1]
+        return resultNode
+
+    def _firstNodeAfter(self, order: Union[float, int], inclusive: bool) -> Union[BinaryNode, None]:
+        """
+        Get the first node whose order is greater than giving order.
+
+        :param order: Node order.
+        :param inclusive: Accept node with same order as well if inclusive is True.
+        :return: Node in tree. Return None if there's no such node.
+        """
+
+        resultNode = None
+        iterNode = self._rootNode
+        while iterNode:
+            if iterNode._order > order or (inclusive and iterNode._order == order):
+                resultNode = iterNode
+                iterNode = iterNode._leftChildNode
+            else:
+                iterNode = iterNode._rightChildNode
+        return resultNode
+
+    def nextNode(self, node: BinaryNode) -> Union[BinaryNode, None]:
+        """
+        Get the node right after giving node in sorted list.
+
+        It walks through parent links, so no stack is needed. Giving node should be in this tree.
+
+        In multiset mode, the owner of bucket of a node is found by searching its order. Position in bucket is taken
+        from the node, bucket isn't scanned.
+
+        :param node: Node in tree.
+        :return: Next node. Return None if giving node is the last one.
+        """
+
+        if self._isInBucket(node):
+            bucketNode = self._searchUnder(self._rootNode, node._order)
+            duplicateNodes = bucketNode._duplicateNodes
+            i = node._index - duplicateNodes[0]._index
+            if i + 1 < len(duplicateNodes):
+                return duplicateNodes[i + 1]
+            node = bucketNode
+        elif node._duplicateNodes:
+            return node._duplicateNodes[0]
+        if node._rightChildNode:
+            node = node._rightChildNode
+            while node._leftChildNode:
+                node = node._leftChildNode
+            return node
+        while node._parentNode and node._parentNode._rightChildNode == node:
+            node = node._parentNode
+        return node._parentNode
+
+    def previousNode(self, node: BinaryNode) -> Union[BinaryNode, None]:
+        """
+        Get the node right before giving node in sorted list.
+
+        It walks through parent links, so no stack is needed. Giving node should be in this tree.
+
+        In multiset mode, the owner of bucket of a node is found by searching its order. Position in bucket is taken
+        from the node, bucket isn't scanned.
+
+        :param node: Node in tree.
+        :return: Previous node. Return None if giving node is the first one.
+        """
+
+        if self._isInBucket(node):
+            bucketNode = self._searchUnder(self._rootNode, node._order)
+            duplicateNodes = bucketNode._duplicateNodes
+            i = node._index - duplicateNodes[0]._index
+            return duplicateNodes[i - 1] if i else bucketNode
+        if node._leftChildNode:
+            node = node._leftChildNode
+            while node._rightChildNode:
+                node = node._rightChildNode
+        else:
+            while node._parentNode and node._parentNode._leftChildNode == node:
+                node = node._parentNode
+            node = node._parentNode
+        if node and node._duplicateNodes:
+            return node._duplicateNodes[-1]
+        return node
+
+    def _isInBucket(self, node: BinaryNode) -> bool:
+        """
+        Check whether node is kept in bucket of another node instead of being linked into tree.
+
+        :param node: Node in tree.
+        :return: Boolean.
+        """
+
+        return self._multiset and node._index != -1
+
+    def _appendIntoBucket(self, bucketNode: BinaryNode, node: BinaryNode):
+        """
+        Append node into bucket of a node in multiset tree.
+
+        Nodes in bucket are numbered in increasing sequence by _index, so position in bucket is the difference from
+        the first one. Nodes linked into tree have _index -1, which marks whether a node is in bucket.
+
+        :param bucketNode: Node linked into tree.
+        :param node: Node with the same order.
+        :return: None.
+        """
+
+        duplicateNodes = bucketNode._duplicateNodes
+        if not duplicateNodes:
+            duplicateNodes = bucketNode._duplicateNodes = deque()
+            node._index = 0
+        else:
+            node._index = duplicateNodes[-1]._index + 1
+        duplicateNodes.append(node)
+
+    def maxNode(self) -> Union[BinaryNode, None]:
+        """
+        Get max order node in tree.
+
+        :return: Max order node in tree. Return None if tree is empty.
+        """
+
+        if not self._rootNode:
+            return None
+        else:
+            iterNode = self._rootNode
+            while iterNode:
+                if iterNode._rightChildNode:
                     iterNode = iterNode._rightChildNode
+                elif iterNode._duplicateNodes:
+                    return iterNode._duplicateNodes[-1]
                 else:
                     return iterNode
 
@@ -382,16 +1181,15 @@ class BinarySearchTree:
         """
 
         node = self.maxNode()
-        if node:
-            if node._parentNode:
-                node._parentNode._rightChildNode = node._leftChildNode
-            else:
-                self._rootNode = node._leftChildNode
-            if node._leftChildNode:
-                node._leftChildNode._parentNode = node._parentNode
-            node._leftChildNode = None
-            node._parentNode = None
-            node._inTree = False
+        if node and self._isInBucket(node):
+            bucketNode = self._searchUnder(self._rootNode, node._order)
+            bucketNode._duplicateNodes.pop()
+            if not bucketNode._duplicateNodes:
+                bucketNode._duplicateNodes = None
+            self._resetNode(node)
+            self._rootNode = self._retrace(bucketNode)
+        elif node:
+            self._removeNode(node)
         return node
 
     def deleteMinNode(self) -> Union[BinaryNode, None]:
@@ -403,15 +1201,7 @@ class BinarySearchTree:
 
         node = self.minNode()
         if node:
-            if node._parentNode:
-                node._parentNode._leftChildNode = node._rightChildNode
-            else:
-                self._rootNode = node._rightChildNode
-            if node._rightChildNode:
-                node._rightChildNode._parentNode = node._parentNode
-            node._rightChildNode = None
-            node._parentNode = None
-            node._inTree = False
+            self._removeNode(node)
         return node
 
     def package(self, onlyOrder: bool = False) -> Union[dict, list, None]:
@@ -420,6 +1210,7 @@ class BinarySearchTree:
 
         :param onlyOrder: Return tree only contains order in each node if onlyOrder is True. Default is False.
         :return: Tree structure as dictionary. Return type is list if onlyOrder is True. Return None if tree is empty.
+        In multiset mode, nodes in bucket are shown as a chain of right children, followed by the right subtree.
         """
 
         return self._package(self._rootNode, onlyOrder)
@@ -428,6 +1219,8 @@ class BinarySearchTree:
         """
         Package tree structure and return.
 
+        Tree is walked with a stack instead of recursion, so a deep unbalanced tree doesn't hit recursion limit.
+
         :param node: Root node of tree.
         :param onlyOrder: Return tree only contains order in each node if onlyOrder is True. Default is False.
         :return: Tree structure as dictionary. Return type is list if onlyOrder is True. Return None if tree is empty.
@@ -439,20 +1232,62 @@ class BinarySearchTree:
                 return [None]
             else:
                 return None
+        if onlyOrder:
+            leftKey, rightKey = 1, 2
         else:
-            if onlyOrder:
-                return [
-                    node._order,
-                    self._package(node._leftChildNode, onlyOrder),
-                    self._package(node._rightChildNode, onlyOrder)
-                ]
-            else:
-                return {
-                    Constants.BinaryNode.order: node._order,
-                    Constants.BinaryNode.value: node._value,
-                    Constants.BinaryNode.leftChildNode: self._package(node._leftChildNode),
-                    Constants.BinaryNode.rightChildNode: self._package(node._rightChildNode)
-                }
+            leftKey, rightKey = Constants.BinaryNode.leftChildNode, Constants.BinaryNode.rightChildNode
+        rootPackage = self._packageNode(node, None, None, onlyOrder)
+        # Stack holds packages whose children are not filled yet, with their nodes.
+        stk = [(rootPackage, node)]
+        while stk:
+            package, node = stk.pop()
+            for key, childNode in ((leftKey, node._leftChildNode), (rightKey, node._rightChildNode)):
+                if key == rightKey and node._duplicateNodes:
+                    for duplicateNode in node._duplicateNodes:
+                        package[rightKey] = self._packageNode(duplicateNode, [None] if onlyOrder else None, None,
+                                                              onlyOrder)
+                        package = package[rightKey]
+                if childNode:
+                    package[key] = self._packageNode(childNode, None, None, onlyOrder)
+                    stk.append((package[key], childNode))
+                else:
+                    package[key] = [None] if onlyOrder else None
+        return rootPackage
+
+    def dump(self, fp: TextIO, onlyOrder: bool = False):
+        """
+        Write tree structure into file-like object as JSON, in the same structure as package.
+
+        Tree is written while it's walked without recursion, memory is proportional to tree height.
+
+        :param fp: File-like object with write method, e.g. a file opened in text mode.
+        :param onlyOrder: Write tree only contains order in each node if onlyOrder is True. Default is False.
+        :return: None.
+        """
+
+        _dumpTree(fp, self._rootNode, onlyOrder)
+
+    def _packageNode(self, node: BinaryNode, leftPackage: Union[dict, list, None],
+                     rightPackage: Union[dict, list, None], onlyOrder: bool) -> Union[dict, list]:
+        """
+        Package a node with packaged children.
+
+        :param node: Binary node.
+        :param leftPackage: Packaged left subtree.
+        :param rightPackage: Packaged right subtree.
+        :param onlyOrder: Return list only contains order if onlyOrder is True.
+        :return: Node structure as dictionary. Return type is list if onlyOrder is True.
+        """
+
+        if onlyOrder:
+            return [node._order, leftPackage, rightPackage]
+        else:
+            return {
+                Constants.BinaryNode.order: node._order,
+                Constants.BinaryNode.value: node._value,
+                Constants.BinaryNode.leftChildNode: leftPackage,
+                Constants.BinaryNode.rightChildNode: rightPackage
+            }
 
     def balance(self):
         """
@@ -461,42 +1296,169 @@ class BinarySearchTree:
         :return: None.
         """
 
-        orderedList = self.orderedList()
-        if len(orderedList) > 2:
-            self._rootNode = self._balance(orderedList)
+        count = self._nodeCount(self._rootNode)
+        if count > 2:
+            # Nodes in bucket are taken as well and gathered again in multiset mode.
+            self._rootNode = self._buildFromSorted(self._iterAllNodes(self._rootNode), count)
 
-    def _balance(self, orderedList: List[BinaryNode]) -> BinaryNode:
+    def freeze(self) -> FrozenBinarySearchTree:
         """
-        Balance tree.
+        Take a read-only snapshot of tree. NumPy is required.
 
-        :param orderedList: List of node.
-        :return: None.
+        Later changes of tree don't affect the snapshot.
+
+        :return: Frozen tree.
         """
 
-        if len(orderedList) == 1:
-            orderedList[0]._parentNode = None
-            orderedList[0]._leftChildNode = None
-            orderedList[0]._rightChildNode = None
-            return orderedList[0]
-        elif len(orderedList) == 2:
-            orderedList[0]._parentNode = orderedList[1]
-            orderedList[0]._leftChildNode = None
-            orderedList[0]._rightChildNode = None
-            orderedList[1]._parentNode = None
-            orderedList[1]._leftChildNode = orderedList[0]
-            orderedList[1]._rightChildNode = None
-            return orderedList[1]
-        else:
-            centerIndex = len(orderedList) // 2
-            centerNode = orderedList[centerIndex]
-            leftNode = self._balance(orderedList[:centerIndex])
-            rightNode = self._balance(orderedList[centerIndex + 1:])
-            centerNode._parentNode = None
-            centerNode._leftChildNode = leftNode
-            centerNode._rightChildNode = rightNode
+        return FrozenBinarySearchTree(self._iterAllNodes(self._rootNode))
+
+    def _iterNodes(self, rootNode: Union[BinaryNode, None], stk: Union[deque, None] = None) -> Iterator[BinaryNode]:
+        """
+        Iterate nodes by order with specific root node.
+
+        Right child is read before a node is yielded, so nodes that have been yielded can be relinked safely.
+
+        :param rootNode: Root node of tree.
+        :param stk: Stack of ancestors which are still waiting to be visited. Default is an empty stack.
+        :return: Iterator of node.
+        """
+
+        if stk is None:
+            stk = deque()
+        node = rootNode
+        while node or len(stk):
+            while node:
+                stk.append(node)
+                node = node._leftChildNode
+            node = stk.pop()
+            rightNode = node._rightChildNode
+            yield node
+            node = rightNode
+
+    def _iterAllNodes(self, rootNode: Union[BinaryNode, None]) -> Iterator[BinaryNode]:
+        """
+        Iterate nodes by order with specific root node, nodes in bucket included.
+
+        :param rootNode: Root node of tree.
+        :return: Iterator of node.
+        """
+
+        return self._expandNodes(self._iterNodes(rootNode))
+
+    def _expandNodes(self, nodeIter: Iterator[BinaryNode]) -> Iterator[BinaryNode]:
+        """
+        Yield each node followed by nodes in its bucket.
+
+        Bucket is read before a node is yielded, so nodes that have been yielded can be relinked safely.
+
+        :param nodeIter: Iterator of node linked into tree.
+        :return: Iterator of node.
+        """
+
+        for node in nodeIter:
+            duplicateNodes = node._duplicateNodes
+            yield node
+            if duplicateNodes:
+                yield from duplicateNodes
+
+    def _iterAllNodesReversed(self, rootNode: Union[BinaryNode, None]) -> Iterator[BinaryNode]:
+        """
+        Iterate nodes by descending order with specific root node, nodes in bucket included.
+
+        :param rootNode: Root node of tree.
+        :return: Iterator of node.
+        """
+
+        for node in self._iterNodesReversed(rootNode):
+            if node._duplicateNodes:
+                yield from reversed(node._duplicateNodes)
+            yield node
+
+    def _iterNodesReversed(self, rootNode: Union[BinaryNode, None]) -> Iterator[BinaryNode]:
+        """
+        Iterate nodes by descending order with specific root node.
+
+        :param rootNode: Root node of tree.
+        :return: Iterator of node.
+        """
+
+        stk = deque()
+        node = rootNode
+        while node or len(stk):
+            while node:
+                stk.append(node)
+                node = node._rightChildNode
+            node = stk.pop()
+            leftNode = node._leftChildNode
+            yield node
+            node = leftNode
+
+    def _buildBalanced(self, nodeIter: Iterator[BinaryNode], count: int) -> Union[BinaryNode, None]:
+        """
+        Build balanced tree by taking nodes from a sorted iterator.
+
+        Nodes are taken in order, left subtree first, so neither slicing nor indexing is needed.
+        Recursion depth is O(log n).
+
+        :param nodeIter: Iterator of node sorted by order.
+        :param count: How many nodes to take from iterator.
+        :return: Root node of tree. Return None if count is 0.
+        """
+
+        if count <= 0:
+            return None
+        leftNode = self._buildBalanced(nodeIter, count // 2)
+        centerNode = next(nodeIter)
+        rightNode = self._buildBalanced(nodeIter, count - count // 2 - 1)
+        centerNode._parentNode = None
+        centerNode._index = -1
+        centerNode._leftChildNode = leftNode
+        centerNode._rightChildNode = rightNode
+        if leftNode:
             leftNode._parentNode = centerNode
+        if rightNode:
             rightNode._parentNode = centerNode
-            return centerNode
+        self._refreshNode(centerNode)
+        return centerNode
+
+    def _buildFromSorted(self, nodeIter: Iterator[BinaryNode], count: int) -> Union[BinaryNode, None]:
+        """
+        Build balanced tree from a sorted iterator of node in the mode of this tree.
+
+        In multiset mode, nodes with the same order are gathered into the bucket of the first one.
+
+        :param nodeIter: Iterator of node sorted by order. Nodes in bucket should be included.
+        :param count: How many nodes to take from iterator.
+        :return: Root node of tree. Return None if count is 0.
+        """
+
+        if not self._multiset:
+            return self._buildBalanced(self._dropBuckets(nodeIter), count)
+        nodeList = []
+        for _, node in zip(range(count), nodeIter):
+            if nodeList and nodeList[-1]._order == node._order:
+                self._appendIntoBucket(nodeList[-1], node)
+                node._leftChildNode = None
+                node._rightChildNode = None
+                node._parentNode = None
+                node._height = 0
+                node._size = 1
+            else:
+                nodeList.append(node)
+            node._duplicateNodes = None
+        return self._buildBalanced(iter(nodeList), len(nodeList))
+
+    def _dropBuckets(self, nodeIter: Iterator[BinaryNode]) -> Iterator[BinaryNode]:
+        """
+        Clear bucket of each node, nodes in bucket should be taken from iterator as well.
+
+        :param nodeIter: Iterator of node.
+        :return: Iterator of node.
+        """
+
+        for node in nodeIter:
+            node._duplicateNodes = None
+            yield node
 
     def merge(self, tree: 'BinarySearchTree'):
         """
@@ -506,22 +1468,413 @@ class BinarySearchTree:
         :return: None.
         """
 
-        l1 = self.orderedList()
-        l2 = tree.orderedList()
-        orderedList = []
-        while l1 and l2:
-            if l1[0]._order >= l2[0]._order:
-                orderedList.append(l2[0])
-                del l2[0]
+        _checkNodeClass(tree._nodeClass, self._nodeClass)
+        count = self._nodeCount(self._rootNode) + tree._nodeCount(tree._rootNode)
+        # Nodes from the merged tree go first if orders are the same.
+        orderedNodes = merge(tree._iterAllNodes(tree._rootNode), self._iterAllNodes(self._rootNode),
+                             key=attrgetter('_order'))
+        self._rootNode = self._buildFromSorted(orderedNodes, count)
+        tree._rootNode = None
+
+    def split(self, order: Union[float, int]) -> Tuple['BinarySearchTree', 'BinarySearchTree']:
+        """
+        Split tree into two trees by order. Nodes are relinked, not copied.
+
+        This tree will be clear.
+
+        :param order: Node order.
+        :return: A tree with nodes whose order is less than giving order and a tree with the rest nodes.
+        """
+
+        leftNode, rightNode = self._splitNodes(self._rootNode, order, False)
+        self._rootNode = None
+        return self._newTree(leftNode), self._newTree(rightNode)
+
+    def join(self, tree: 'BinarySearchTree'):
+        """
+        Join a tree whose orders are all greater than or equal to (or all less than or equal to) orders in this tree.
+
+        The tree that be joined will be clear.
+
+        :param tree: Tree that will be joined.
+        :return: None.
+        """
+
+        _checkNodeClass(tree._nodeClass, self._nodeClass)
+        if not tree._rootNode:
+            return
+        if self._rootNode:
+            if self.maxNode()._order <= tree.minNode()._order:
+                leftTree, rightTree = self, tree
+            elif tree.maxNode()._order <= self.minNode()._order:
+                leftTree, rightTree = tree, self
             else:
-                orderedList.append(l1[0])
-                del l1[0]
-        if l1:
-            orderedList = orderedList + l1
-        elif l2:
-            orderedList = orderedList + l2
-        self._rootNode = self._balance(orderedList)
+                raise Exception('Orders of two trees overlap')
+            if self._multiset != tree._multiset or (self._balanced and not tree._balanced):
+                tree._rootNode = self._buildFromSorted(tree._iterAllNodes(tree._rootNode),
+                                                       tree._nodeCount(tree._rootNode))
+            leftNode, rightNode = leftTree._rootNode, rightTree._rootNode
+            if self._multiset:
+                # The same order may sit on both sides, move the right one into the bucket of the left one.
+                bucketNode = leftNode
+                while bucketNode._rightChildNode:
+                    bucketNode = bucketNode._rightChildNode
+                minNode = rightNode
+                while minNode._leftChildNode:
+                    minNode = minNode._leftChildNode
+                if minNode._order == bucketNode._order:
+                    minNode, rightNode = self._popMinNode(rightNode)
+                    duplicateNodes = minNode._duplicateNodes
+                    minNode._leftChildNode = None
+                    minNode._rightChildNode = None
+                    minNode._parentNode = None
+                    minNode._height = 0
+                    minNode._size = 1
+                    minNode._duplicateNodes = None
+                    self._appendIntoBucket(bucketNode, minNode)
+                    for duplicateNode in duplicateNodes or ():
+                        self._appendIntoBucket(bucketNode, duplicateNode)
+                    leftNode = self._retrace(bucketNode)
+            self._rootNode = self._joinNodes2(leftNode, rightNode)
+        elif self._multiset != tree._multiset or (self._balanced and not tree._balanced):
+            self._rootNode = self._buildFromSorted(tree._iterAllNodes(tree._rootNode), tree._nodeCount(tree._rootNode))
+        else:
+            self._rootNode = tree._rootNode
+        tree._rootNode = None
+
+    def union(self, tree: 'BinarySearchTree') -> List[BinaryNode]:
+        """
+        Add nodes of another tree whose order does not exist in this tree.
+
+        Nodes are relinked, not copied. The tree that be united will be clear.
+
+        :param tree: Tree that will be united.
+        :return: Nodes of giving tree which are dropped because their order already exists in this tree.
+        """
+
+        _checkNodeClass(tree._nodeClass, self._nodeClass)
+        droppedNodes = []
+        if self._balanced and tree._balanced and self._multiset == tree._multiset:
+            # Split/join the giving tree along the nodes of this tree, work is proportional to the smaller tree.
+            self._rootNode = self._unionNodes(self._rootNode, tree._rootNode, droppedNodes)
+        else:
+            nodeList = []
+            selfIter = self._iterAllNodes(self._rootNode)
+            selfNode = next(selfIter, None)
+            lastOrder = None
+            for node in tree._iterAllNodes(tree._rootNode):
+                while selfNode and selfNode._order <= node._order:
+                    nodeList.append(selfNode)
+                    lastOrder = selfNode._order
+                    selfNode = next(selfIter, None)
+                if nodeList and lastOrder == node._order:
+                    droppedNodes.append(node)
+                else:
+                    nodeList.append(node)
+            while selfNode:
+                nodeList.append(selfNode)
+                selfNode = next(selfIter, None)
+            self._rootNode = self._buildFromSorted(iter(nodeList), len(nodeList))
+        for node in droppedNodes:
+            self._resetNode(node)
         tree._rootNode = None
+        return droppedNodes
+
+    def intersection(self, tree: 'BinarySearchTree') -> List[BinaryNode]:
+        """
+        Keep nodes whose order also exists in another tree.
+
+        The giving tree is not modified.
+
+        :param tree: Tree to compare.
+        :return: Nodes which are removed from this tree.
+        """
+
+        removedNodes = []
+        if self._balanced and tree._balanced:
+            self._rootNode = self._intersectionNodes(self._rootNode, tree._rootNode, removedNodes)
+        else:
+            nodeList = self._filterByTree(tree, True, removedNodes)
+            self._rootNode = self._buildBalanced(iter(nodeList), len(nodeList))
+        for node in removedNodes:
+            self._resetNode(node)
+        return removedNodes
+
+    def difference(self, tree: 'BinarySearchTree') -> List[BinaryNode]:
+        """
+        Remove nodes whose order exists in another tree.
+
+        The giving tree is not modified.
+
+        :param tree: Tree to compare.
+        :return: Nodes which are removed from this tree.
+        """
+
+        removedNodes = []
+        if self._balanced and tree._balanced:
+            self._rootNode = self._differenceNodes(self._rootNode, tree._rootNode, removedNodes)
+        else:
+            nodeList = self._filterByTree(tree, False, removedNodes)
+            self._rootNode = self._buildBalanced(iter(nodeList), len(nodeList))
+        for node in removedNodes:
+            self._resetNode(node)
+        return removedNodes
+
+    def _filterByTree(self, tree: 'BinarySearchTree', keepCommon: bool,
+                      removedNodes: List[BinaryNode]) -> List[BinaryNode]:
+        """
+        Walk two trees by order together and split nodes of this tree by whether their order exists in giving tree.
+
+        :param tree: Tree to compare.
+        :param keepCommon: Keep nodes whose order exists in giving tree if keepCommon is True, otherwise keep the rest.
+        :param removedNodes: Nodes which are not kept will be appended, nodes in their buckets included.
+        :return: Nodes which are kept, sorted by order. Nodes in bucket stay in the bucket.
+        """
+
+        nodeList = []
+        treeIter = tree._iterNodes(tree._rootNode)
+        treeNode = next(treeIter, None)
+        for node in self._iterNodes(self._rootNode):
+            while treeNode and treeNode._order < node._order:
+                treeNode = next(treeIter, None)
+            if (treeNode is not None and treeNode._order == node._order) == keepCommon:
+                nodeList.append(node)
+            else:
+                removedNodes.append(node)
+                if node._duplicateNodes:
+                    removedNodes.extend(node._duplicateNodes)
+        return nodeList
+
+    def _splitNodes3(self, rootNode: Union[BinaryNode, None], order: Union[float, int]) -> Tuple[
+            Union[BinaryNode, None], Union[BinaryNode, None], Union[BinaryNode, None]]:
+        """
+        Split subtree into nodes less than, equal to and greater than order.
+
+        :param rootNode: Root node of subtree, it should not have parent.
+        :param order: Node order.
+        :return: Root nodes of three subtrees.
+        """
+
+        lessNode, rightNode = self._splitNodes(rootNode, order, False)
+        equalNode, greaterNode = self._splitNodes(rightNode, order, True)
+        return lessNode, equalNode, greaterNode
+
+    def _unionNodes(self, node: Union[BinaryNode, None], otherNode: Union[BinaryNode, None],
+                    droppedNodes: List[BinaryNode]) -> Union[BinaryNode, None]:
+        """
+        Union two subtrees by splitting the other subtree with each node of this subtree.
+
+        :param node: Root node of subtree in this tree, it should not have parent.
+        :param otherNode: Root node of subtree in the other tree, it should not have parent.
+        :param droppedNodes: Nodes of the other subtree whose order exists in this subtree will be appended.
+        :return: Root node of united subtree.
+        """
+
+        if not otherNode:
+            return node
+        if not node:
+            return otherNode
+        leftNode, rightNode = node._leftChildNode, node._rightChildNode
+        if leftNode:
+            leftNode._parentNode = None
+        if rightNode:
+            rightNode._parentNode = None
+        lessNode, equalNode, greaterNode = self._splitNodes3(otherNode, node._order)
+        leftNode = self._unionNodes(leftNode, lessNode, droppedNodes)
+        droppedNodes.extend(self._iterAllNodes(equalNode))
+        rightNode = self._unionNodes(rightNode, greaterNode, droppedNodes)
+        return self._joinNodes(leftNode, node, rightNode)
+
+    def _intersectionNodes(self, node: Union[BinaryNode, None], otherNode: Union[BinaryNode, None],
+                           removedNodes: List[BinaryNode]) -> Union[BinaryNode, None]:
+        """
+        Intersect subtree of this tree with a read-only subtree of the other tree.
+
+        :param node: Root node of subtree in this tree, it should not have parent.
+        :param otherNode: Root node of subtree in the other tree.
+        :param removedNodes: Nodes of this subtree whose order does not exist in the other subtree will be appended.
+        :return: Root node of intersected subtree.
+        """
+
+        if not node:
+            return None
+        if not otherNode:
+            removedNodes.extend(self._iterAllNodes(node))
+            return None
+        lessNode, equalNode, greaterNode = self._splitNodes3(node, otherNode._order)
+        leftNode = self._intersectionNodes(lessNode, otherNode._leftChildNode, removedNodes)
+        rightNode = self._intersectionNodes(greaterNode, otherNode._rightChildNode, removedNodes)
+        return self._joinNodes2(self._joinNodes2(leftNode, equalNode), rightNode)
+
+    def _differenceNodes(self, node: Union[BinaryNode, None], otherNode: Union[BinaryNode, None],
+                         removedNodes: List[BinaryNode]) -> Union[BinaryNode, None]:
+        """
+        Remove nodes whose order exists in a read-only subtree of the other tree.
+
+        :param node: Root node of subtree in this tree, it should not have parent.
+        :param otherNode: Root node of subtree in the other tree.
+        :param removedNodes: Nodes of this subtree whose order exists in the other subtree will be appended.
+        :return: Root node of remaining subtree.
+        """
+
+        if not node or not otherNode:
+            return node
+        lessNode, equalNode, greaterNode = self._splitNodes3(node, otherNode._order)
+        leftNode = self._differenceNodes(lessNode, otherNode._leftChildNode, removedNodes)
+        removedNodes.extend(self._iterAllNodes(equalNode))
+        rightNode = self._differenceNodes(greaterNode, otherNode._rightChildNode, removedNodes)
+        return self._joinNodes2(leftNode, rightNode)
+
+    def _newTree(self, rootNode: Union[BinaryNode, None]) -> 'BinarySearchTree':
+        """
+        Create a tree with same mode as this tree.
+
+        :param rootNode: Root node of new tree.
+        :return: New tree.
+        """
+
+        tree = self.__class__(balanced=self._balanced, multiset=self._multiset, nodeClass=self._nodeClass)
+        tree._rootNode = rootNode
+        return tree
+
+    def _joinNodes(self, leftNode: Union[BinaryNode, None], centerNode: BinaryNode,
+                   rightNode: Union[BinaryNode, None]) -> BinaryNode:
+        """
+        Join two subtrees with a center node.
+
+        Orders in left subtree <= order of center node <= orders in right subtree.
+        In balanced mode, center node is hung on the spine of the higher subtree and the path is rebalanced,
+        so it takes O(|height difference| + 1).
+
+        :param leftNode: Root node of left subtree, it should not have parent.
+        :param centerNode: Node between two subtrees.
+        :param rightNode: Root node of right subtree, it should not have parent.
+        :return: Root node of joined subtree.
+        """
+
+        leftHeight = self._height(leftNode)
+        rightHeight = self._height(rightNode)
+        if self._balanced and leftHeight > rightHeight + 1:
+            parentNode = None
+            iterNode = leftNode
+            while self._height(iterNode) > rightHeight + 1:
+                parentNode = iterNode
+                iterNode = iterNode._rightChildNode
+            self._linkChildren(centerNode, iterNode, rightNode)
+            parentNode._rightChildNode = centerNode
+            centerNode._parentNode = parentNode
+            return self._retrace(parentNode)
+        elif self._balanced and rightHeight > leftHeight + 1:
+            parentNode = None
+            iterNode = rightNode
+            while self._height(iterNode) > leftHeight + 1:
+                parentNode = iterNode
+                iterNode = iterNode._leftChildNode
+            self._linkChildren(centerNode, leftNode, iterNode)
+            parentNode._leftChildNode = centerNode
+            centerNode._parentNode = parentNode
+            return self._retrace(parentNode)
+        else:
+            self._linkChildren(centerNode, leftNode, rightNode)
+            centerNode._parentNode = None
+            return centerNode
+
+    def _joinNodes2(self, leftNode: Union[BinaryNode, None],
+                    rightNode: Union[BinaryNode, None]) -> Union[BinaryNode, None]:
+        """
+        Join two subtrees. Orders in left subtree <= orders in right subtree.
+
+        Min node of right subtree is taken out and used as center node.
+
+        :param leftNode: Root node of left subtree, it should not have parent.
+        :param rightNode: Root node of right subtree, it should not have parent.
+        :return: Root node of joined subtree.
+        """
+
+        if not leftNode:
+            return rightNode
+        if not rightNode:
+            return leftNode
+        centerNode, rightNode = self._popMinNode(rightNode)
+        return self._joinNodes(leftNode, centerNode, rightNode)
+
+    def _popMinNode(self, rootNode: BinaryNode) -> Tuple[BinaryNode, Union[BinaryNode, None]]:
+        """
+        Take min node out of subtree. Links of min node are left for the caller to overwrite.
+
+        :param rootNode: Root node of subtree, it should not have parent.
+        :return: Min node and root node of the rest subtree.
+        """
+
+        minNode = rootNode
+        while minNode._leftChildNode:
+            minNode = minNode._leftChildNode
+        if minNode == rootNode:
+            rootNode = minNode._rightChildNode
+            if rootNode:
+                rootNode._parentNode = None
+        else:
+            parentNode = minNode._parentNode
+            parentNode._leftChildNode = minNode._rightChildNode
+            if minNode._rightChildNode:
+                minNode._rightChildNode._parentNode = parentNode
+            rootNode = self._retrace(parentNode)
+        return minNode, rootNode
+
+    def _splitNodes(self, rootNode: Union[BinaryNode, None], order: Union[float, int],
+                    inclusive: bool) -> Tuple[Union[BinaryNode, None], Union[BinaryNode, None]]:
+        """
+        Split subtree by order.
+
+        The path from root to the split point is walked down once, then subtrees hanging off the path are joined
+        bottom-up. In balanced mode it takes O(log n).
+
+        :param rootNode: Root node of subtree, it should not have parent.
+        :param order: Node order.
+        :param inclusive: Nodes with same order go to the left subtree if inclusive is True.
+        :return: Root node of left subtree and root node of right subtree.
+        """
+
+        path = []
+        iterNode = rootNode
+        while iterNode:
+            path.append(iterNode)
+            if iterNode._order < order or (inclusive and iterNode._order == order):
+                iterNode = iterNode._rightChildNode
+            else:
+                iterNode = iterNode._leftChildNode
+        leftNode = None
+        rightNode = None
+        for iterNode in reversed(path):
+            if iterNode._order < order or (inclusive and iterNode._order == order):
+                childNode = iterNode._leftChildNode
+                if childNode:
+                    childNode._parentNode = None
+                leftNode = self._joinNodes(childNode, iterNode, leftNode)
+            else:
+                childNode = iterNode._rightChildNode
+                if childNode:
+                    childNode._parentNode = None
+                rightNode = self._joinNodes(rightNode, iterNode, childNode)
+        return leftNode, rightNode
+
+    def _linkChildren(self, node: BinaryNode, leftNode: Union[BinaryNode, None], rightNode: Union[BinaryNode, None]):
+        """
+        Link node with its new children and refresh bookkeeping.
+
+        :param node: Parent node.
+        :param leftNode: New left child.
+        :param rightNode: New right child.
+        :return: None.
+        """
+
+        node._leftChildNode = leftNode
+        node._rightChildNode = rightNode
+        if leftNode:
+            leftNode._parentNode = node
+        if rightNode:
+            rightNode._parentNode = node
+        self._refreshNode(node)
 
     def clear(self):
         """
@@ -540,8 +1893,8 @@ class BinarySearchTree:
                         q.append(node._leftChildNode)
                     if node._rightChildNode:
                         q.append(node._rightChildNode)
-                    node._parentNode = None
-                    node._leftChildNode = None
-                    node._rightChildNode = None
-                    node._inTree = False
+                    if node._duplicateNodes:
+                        for duplicateNode in node._duplicateNodes:
+                            self._resetNode(duplicateNode)
+                    self._resetNode(node)
         self._rootNode = None
@@ -0,0 +1,132 @@
+"""
+Module of frozen binary search tree.
+"""
+
+from .binaryNode import BinaryNode
+from ._util import _importNumpy
+from typing import Union, Iterable, Any
+
+
+class FrozenBinarySearchTree:
+
+    def __init__(self, nodes: Iterable[BinaryNode] = ()):
+        """
+        Module of frozen binary search tree.
+
+        Read-only snapshot of a binary search tree. Orders are stored in a sorted NumPy array and values in a parallel
+        object array, so a batch of queries is answered by one vectorized binary search.
+
+        :param nodes: Binary nodes sorted by order.
+        """
+
+        numpy = _importNumpy('freeze tree')
+        # NumPy is imported when a tree is frozen, it's kept for queries.
+        self._numpy = numpy
+        orders = []
+        values = []
+        for node in nodes:
+            orders.append(node._order)
+            values.append(node._value)
+        self._orders = numpy.array(orders)
+        # Assign by slice so values like lists or tuples are kept as single objects.
+        self._values = numpy.empty(len(values), dtype=object)
+        self._values[:] = values
+        self._orders.flags.writeable = False
+        self._values.flags.writeable = False
+
+    @property
+    def orders(self) -> 'numpy.ndarray':
+        return self._orders
+
+    @property
+    def values(self) -> 'numpy.ndarray':
+        return self._values
+
+    def nodeCount(self) -> int:
+        """
+        Calculate how many nodes are in tree.
+
+        :return: Nodes number in tree.
+        """
+
+        return len(self._orders)
+
+    def _searchSorted(self, orders: 'numpy.ndarray', side: str) -> 'numpy.ndarray':
+        """
+        Find insertion positions of orders in order array.
+
+        Large batches are searched in sorted sequence, so consecutive binary searches touch nearby memory.
+
+        :param orders: Array of orders.
+        :param side: 'left' or 'right', same as numpy.searchsorted.
+        :return: Int array of positions.
+        """
+
+        numpy = self._numpy
+        if orders.ndim != 1 or len(orders) < 1024:
+            return numpy.searchsorted(self._orders, orders, side)
+        sequence = numpy.argsort(orders, kind='stable')
+        indexes = numpy.empty(len(orders), dtype=numpy.intp)
+        indexes[sequence] = numpy.searchsorted(self._orders, orders[sequence], side)
+        return indexes
+
+    def _search(self, orders: Any) -> tuple:
+        """
+        Search first position of each order.
+
+        :param orders: Order or array of orders.
+        :return: Positions and whether order is found at each position.
+        """
+
+        numpy = self._numpy
+        orders = numpy.asarray(orders)
+        indexes = self._searchSorted(orders, 'left')
+        if not len(self._orders):
+            return indexes, numpy.zeros(orders.shape, dtype=bool)
+        clipped = numpy.minimum(indexes, len(self._orders) - 1)
+        return clipped, (indexes < len(self._orders)) & (self._orders[clipped] == orders)
+
+    def lookup(self, orders: Any) -> Any:
+        """
+        Search values by orders. Value of the first node is returned if there're nodes with same order.
+
+        :param orders: Order or array of orders.
+        :return: Value or object array of values. Value is None if there's no node with giving order.
+        """
+
+        numpy = self._numpy
+        indexes, found = self._search(orders)
+        if not found.ndim:
+            return self._values[indexes] if found else None
+        result = numpy.full(found.shape, None, dtype=object)
+        result[found] = self._values[indexes[found]]
+        return result
+
+    def rank(self, orders: Any) -> Union[int, 'numpy.ndarray']:
+        """
+        Check the rank of node in sorted list with specific orders. Rank start with 0.
+
+        If there's no node with giving order. Rank is -1.
+
+        :param orders: Order or array of orders.
+        :return: Rank or int array of ranks.
+        """
+
+        numpy = self._numpy
+        indexes, found = self._search(orders)
+        result = numpy.where(found, indexes, -1)
+        return int(result) if not result.ndim else result
+
+    def countRange(self, lo: Any, hi: Any) -> Union[int, 'numpy.ndarray']:
+        """
+        Count nodes whose order is between lo and hi (both inclusive).
+
+        :param lo: Lower bound or array of lower bounds.
+        :param hi: Upper bound or array of upper bounds.
+        :return: Nodes number or int array of nodes numbers in each range.
+        """
+
+        numpy = self._numpy
+        lo, hi = numpy.broadcast_arrays(lo, hi)
+        result = numpy.maximum(self._searchSorted(hi, 'right') - self._searchSorted(lo, 'left'), 0)
+        return int(result) if not result.ndim else result